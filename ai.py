@@ -1,166 +1,494 @@
+import os
 import random
 import time
-from app_game_move import get_legal_moves, find_king, is_in_check, is_game_over
+from app_game_move import get_legal_moves, find_king, is_in_check, expand
+from bitboard import iter_squares
+from board import Board
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+from move_ordering import MoveOrderer
+from zobrist import position_key
+from time_manager import TimeManager, allocate_time
 
 
-pruning_stats = {'cuts': 0}
+DEFAULT_TIMEOUT = 4.0  # Seconds per move
+NO_TIME_LIMIT = float('inf')  # timeout for searches bounded by nodes only
+
+# Difficulty levels are budgets rather than depths: the search keeps
+# deepening until the node or time budget runs out, so the cost of a move
+# is bounded whatever the branching factor. The weaker levels also choose
+# among their best `multipv` root moves after adding noise to the scores
+# (in pawns), so they make plausible rather than random mistakes.
+MAX_SEARCH_DEPTH = 32
+DIFFICULTY_LEVELS = {
+    "EASY": {'max_nodes': 3000, 'time_limit': 1.0, 'multipv': 3, 'score_noise': 0.6},
+    "MEDIUM": {'max_nodes': 15000, 'time_limit': 2.0, 'multipv': 2, 'score_noise': 0.2},
+    "HARD": {'max_nodes': 50000, 'time_limit': DEFAULT_TIMEOUT, 'multipv': 1, 'score_noise': 0.0},
+}
+
+# Quiescence search: a capture is skipped when even winning the victim
+# (plus this margin) cannot bring the score back to the window.
+DELTA_MARGIN = 2
+PROMOTION_GAIN = 8  # Queen minus pawn
+
+# Shared across moves so later searches can reuse earlier results
+transposition_table = TranspositionTable()
+
+
+def set_transposition_table_size(entries):
+    """Resize the engine's transposition table (number of entries)"""
+    transposition_table.resize(entries)
 
 
 def get_all_pieces_with_moves(board, color):
+    coords = board.tables.coords
     pieces_with_moves = []
-    for r in range(board.height):
-        for c in range(board.width):
-            piece = board.get_piece(r, c)
-            if piece and piece[0] == color:
-                legal_moves = get_legal_moves(board, r, c)
-                if legal_moves:
-                    pieces_with_moves.append(((r, c), legal_moves))
+    for sq, targets in board.get_legal_move_masks(color)[0]:
+        pieces_with_moves.append((coords[sq], [coords[t] for t in iter_squares(targets)]))
     return pieces_with_moves
 
 
-def get_sorted_moves(board, color, all_pieces_with_moves):
-    sorted_moves = []
-    for (r, c), moves in all_pieces_with_moves:
-        for move in moves:
-            captured = board.get_piece(move[0], move[1])
-            captured_piece, was_promoted, original_piece = board.make_move((r, c), move)
-            score = board.evaluate_board(color)
-            board.undo_move((r, c), move, captured, was_promoted, original_piece)
-            sorted_moves.append(((r, c), move, score))
-    
-    sorted_moves.sort(key=lambda x: x[2], reverse=True)
-    ordered_moves = [(start, end) for start, end, _ in sorted_moves]
-    return ordered_moves
+def get_sorted_moves(board, color, all_pieces_with_moves, orderer=None):
+    """Order moves best-first using captures, promotions and history (no evaluation)"""
+    if orderer is None:
+        orderer = MoveOrderer()
+    moves = [((r, c), move) for (r, c), moves in all_pieces_with_moves for move in moves]
+    return orderer.order(board, moves)
 
 
-def get_ai_move(board, color, difficulty):
-    
-    start_time=time.time()
-    current_color=color
-    all_pieces_with_moves=get_all_pieces_with_moves(board, color)
+class SearchContext:
+    """
+    Book-keeping shared by every node of one search: deadline, node budget
+    and stop flag, plus node and beta-cutoff counters for statistics
+    """
 
-    if not all_pieces_with_moves:
-        return None
+    CHECK_INTERVAL = 64  # Nodes between wall-clock checks
 
-    depth=-1
-    if difficulty == "EASY":
-        depth=2
-    elif difficulty == "MEDIUM":
-        depth=3
-    elif difficulty == "HARD":
-        depth=4
-    elif difficulty == "":
-        depth=4
-
-    total_pieces = sum(1 for r in range(board.height) 
-                     for c in range(board.width) 
-                     if board.get_piece(r, c))
-    
-    if total_pieces <= 11: 
-        depth+=1  
-        print(f"Endgame detected ({total_pieces} pieces), increasing depth to {depth}")
-    elif total_pieces <= 7:  
-        depth+=1
-        print(f"Late endgame detected ({total_pieces} pieces), increasing depth to {depth}")
-
-    ordered_moves=get_sorted_moves(board, color, all_pieces_with_moves)
-        
+    def __init__(self, time_limit=None, max_nodes=None, tt=None, stop_event=None):
+        self.tt = tt
+        self.stop_event = stop_event
+        self.orderer = MoveOrderer()
+        self.start_time = time.time()
+        self.deadline = self.start_time + time_limit if time_limit is not None else None
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.expanded = 0  # Nodes whose moves were searched
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0  # Cutoffs by the first move tried
+        self.root_scores = []  # [(score, move)] of the last completed root search
+        self.time_manager = None  # Soft time limit between iterations, for timed games
+        self._next_check = self.CHECK_INTERVAL
+
+    def tick(self):
+        """Count a node and raise TimeoutError once the time or node budget is spent"""
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise TimeoutError("node budget exhausted")
+        if self.nodes >= self._next_check:
+            self._next_check = self.nodes + self.CHECK_INTERVAL
+            if self.deadline is not None and time.time() >= self.deadline:
+                raise TimeoutError("time budget exhausted")
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise TimeoutError("search cancelled")
+
+    def start_clock(self, time_limit):
+        """Start the time budget now, e.g. when a ponder search becomes the real search"""
+        self.start_time = time.time()
+        self.deadline = self.start_time + time_limit
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def record_cutoff(self, board, move, depth, ply, index):
+        """Count a beta cutoff by the index-th move tried and teach it to the move orderer"""
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        self.orderer.record_cutoff(board, move, depth, ply)
+
+    def cutoff_rate(self):
+        """Fraction of expanded nodes that ended in a beta cutoff"""
+        return self.cutoffs / self.expanded if self.expanded else 0.0
+
+
+def get_level(difficulty):
+    """Budget and weakening settings of a difficulty (HARD for unknown names)"""
+    return DIFFICULTY_LEVELS.get(difficulty, DIFFICULTY_LEVELS["HARD"])
+
+
+def get_search_budget(difficulty, timeout=None, max_nodes=None):
+    """
+    (time limit, node budget) of a difficulty; explicit values replace the
+    level's. Pass timeout=NO_TIME_LIMIT for a node-limited search.
+    """
+    level = get_level(difficulty)
+    if timeout is None:
+        timeout = level['time_limit']
+    if max_nodes is None:
+        max_nodes = level['max_nodes']
+    return timeout, max_nodes
+
+
+def choose_weakened_move(root_scores, multipv, score_noise):
+    """
+    Deliberately imperfect choice for the weaker levels: among the
+    multipv best root moves, the one scoring highest once Gaussian noise
+    (score_noise pawns) is added.
+    """
+    candidates = sorted(root_scores, key=lambda entry: entry[0], reverse=True)[:multipv]
+    return max(candidates, key=lambda entry: entry[0] + random.gauss(0, score_noise))[1]
+
+
+def search_root(board, color, depth, ordered_moves, context, multipv=1):
+    """
+    Search every root move to the given depth and return (best_move, best_score).
+    The window stays open until multipv moves are searched, so the best
+    multipv moves get exact scores; every (score, move) is left in
+    context.root_scores.
+    """
+    opponent_color = 'b' if color == 'w' else 'w'
     best_score = float('-inf')
     best_move = None
-        
-    timeout = 4.0  
-    last_valid_move = best_move
-    last_valid_score = best_score
-    
+    alpha = -float('inf')
+    root_scores = []
+
     for start, end in ordered_moves:
-        if time.time() - start_time > timeout:
-            print(f"Timeout! Returning best move found after {time.time()-start_time:.2f}s")
-            return last_valid_move
-        
         captured_piece, was_promoted, original_piece = board.make_move(start, end)
-        
         try:
-            score = minimax(board, depth-1, -float('inf'), float('inf'), 
-                          False, color, 'b' if color == 'w' else 'w')
-        except TimeoutError:
+            score = minimax(board, depth-1, alpha, float('inf'), 
+                          False, color, opponent_color, context, 1)
+        finally:
             board.undo_move(start, end, captured_piece, was_promoted, original_piece)
-            print(f"Timeout during evaluation! Returning best move so far")
-            return last_valid_move
-        
-        board.undo_move(start, end, captured_piece, was_promoted, original_piece)
-        
+        root_scores.append((score, (start, end)))
+
         if score > best_score:
             best_score = score
             best_move = (start, end)
-            last_valid_move = best_move
-            last_valid_score = best_score
+            if multipv == 1:
+                alpha = max(alpha, score)
             
             if best_score >= 1000:  
                 break
-    
-    elapsed = time.time() - start_time
-    print(f"Move found in {elapsed:.2f}s | Score: {best_score}")
+        if multipv > 1 and len(root_scores) >= multipv:
+            alpha = sorted((entry[0] for entry in root_scores), reverse=True)[multipv - 1]
+
+    context.root_scores = root_scores
+    return best_move, best_score
+
+
+def iterative_deepening(board, color, ordered_moves, max_depth, context,
+                        start_depth=1, on_progress=None, verbose=True, multipv=1):
+    """
+    Search depth start_depth, start_depth + 1, ... up to max_depth until the
+    context's budget runs out. ordered_moves is reordered in place so each
+    iteration tries the previous best move first.
+    Returns (best_move, best_score, completed_depth); if no iteration
+    completes, best_move is the first of ordered_moves.
+    """
+    # Fall back to the statically best move if not even the first iteration completes
+    best_move = ordered_moves[0]
+    best_score = float('-inf')
+    completed_depth = 0
+
+    for depth in range(start_depth, max_depth + 1):
+        try:
+            move, score = search_root(board, color, depth, ordered_moves, context, multipv)
+        except TimeoutError:
+            if verbose:
+                print(f"Timeout during depth {depth}! Returning best move from depth {completed_depth}")
+            break
+
+        best_move, best_score = move, score
+        completed_depth = depth
+        if on_progress is not None:
+            on_progress(depth, context.nodes, best_move)
+
+        # Search the previous iteration's best move first next time
+        ordered_moves.remove(best_move)
+        ordered_moves.insert(0, best_move)
+
+        if best_score >= 1000 or best_score <= -1000:
+            break
+        if context.time_manager is not None and context.time_manager.iteration_done(best_move, context.elapsed()):
+            break
+
+    return best_move, best_score, completed_depth
+
+
+def get_ai_move(board, color, difficulty, timeout=None, max_nodes=None, tt=None,
+                stop_event=None, on_progress=None, context=None, workers=1, verbose=True,
+                time_left=None, increment=0.0, use_book=True):
+    """
+    Pick a move by iterative deepening: search depth 1, 2, 3... until the
+    difficulty's time or node budget runs out (timeout and max_nodes
+    replace the level's when given) or stop_event (a threading.Event) is
+    set. The move from the last fully completed iteration is returned,
+    or for the weaker levels a deliberately noisy pick among the best few.
+    on_progress(depth, nodes, best_move) is called after every iteration.
+    A prepared SearchContext may be passed instead of the budget arguments,
+    which lets the caller change the deadline while the search runs.
+    With workers > 1 the search runs in that many processes (see
+    parallel_search), each with the full budget, falling back to this
+    process if they cannot start. Weakened levels always use one.
+    In timed games, time_left (the side's clock) and increment replace
+    the time limit with soft and hard limits from time_manager; the
+    level's node budget still applies.
+    board may also be a FEN-style string (see notation.py); color None
+    then means the side to move it gives. verbose=False keeps it quiet.
+    Positions in the opening book (see book.py) are answered from it
+    without searching unless use_book is False.
+    """
+    if isinstance(board, str):
+        board, fen_color = Board.from_fen(board)
+        color = color or fen_color
+    if use_book:
+        from book import probe_book
+        book_move = probe_book(board, color)
+        if book_move is not None:
+            if on_progress is not None:
+                on_progress(0, 0, book_move)
+            if verbose:
+                print(f"Book move {book_move}")
+            return book_move
+    level = get_level(difficulty)
+    timeout, max_nodes = get_search_budget(difficulty, timeout, max_nodes)
+    soft_limit = None
+    if time_left is not None:
+        soft_limit, timeout = allocate_time(board, time_left, increment)
+    weakened = level['multipv'] > 1 or level['score_noise'] > 0
+    workers = 1 if weakened else min(workers, os.cpu_count() or 1)
+    if workers > 1 and context is None:
+        from parallel_search import get_parallel_ai_move, shutdown_pool
+        try:
+            return get_parallel_ai_move(board, color, difficulty, workers, timeout,
+                                        max_nodes, stop_event, on_progress, verbose, soft_limit)
+        except (OSError, RuntimeError, NotImplementedError) as error:
+            print(f"Parallel search unavailable ({error}), searching in a single process")
+            # Drop a broken pool so the next move starts a fresh one
+            shutdown_pool()
+
+    if tt is None:
+        tt = transposition_table
+    tt.new_search()
+    if context is None:
+        context = SearchContext(timeout, max_nodes, tt, stop_event)
+        if soft_limit is not None:
+            context.time_manager = TimeManager(soft_limit, timeout)
+    else:
+        context.tt = tt
+    all_pieces_with_moves=get_all_pieces_with_moves(board, color)
+
+    if not all_pieces_with_moves:
+        return None
+
+    ordered_moves=get_sorted_moves(board, color, all_pieces_with_moves, context.orderer)
+    best_move, best_score, completed_depth = iterative_deepening(
+        board, color, ordered_moves, MAX_SEARCH_DEPTH, context,
+        on_progress=on_progress, verbose=verbose, multipv=level['multipv'])
+    if weakened and context.root_scores:
+        best_move = choose_weakened_move(context.root_scores, level['multipv'], level['score_noise'])
+
+    elapsed = context.elapsed()
+    if verbose:
+        print(f"Move found in {elapsed:.2f}s | Depth: {completed_depth} | Nodes: {context.nodes} | "
+          f"TT hits: {tt.hits} | Score: {best_score}")
     return best_move
 
-    
 
-def minimax(board, depth, alpha, beta, is_maximizing, player_color, current_color):
+def get_expected_reply(board, color):
+    """
+    The move the engine expects color to play next: the transposition
+    table's best move for the position, if it is still legal there.
+    After a multi-process search the move is in the workers' shared
+    table instead.
+    """
+    from parallel_search import get_shared_transposition_table
+    key = position_key(board, color)
+    entry = transposition_table.probe(key)
+    shared_tt = get_shared_transposition_table()
+    if (entry is None or entry[3] is None) and shared_tt is not None:
+        entry = shared_tt.probe(key)
+    if entry is None or entry[3] is None:
+        return None
+    start, end = entry[3]
+    piece = board.get_piece(*start)
+    if not piece or piece[0] != color or end not in get_legal_moves(board, *start):
+        return None
+    return entry[3]
+
+
+def minimax(board, depth, alpha, beta, is_maximizing, player_color, current_color, context=None, ply=0):
 
-    game_state = is_game_over(board, current_color)
+    if context is not None:
+        context.tick()
+
+    # Transposition table entries are scored for the side to move;
+    # flip them (and their bounds) when that is not the root player.
+    tt = context.tt if context is not None else None
+    sign = 1 if current_color == player_color else -1
+    hash_move = None
+    if tt is not None:
+        key = position_key(board, current_color)
+        entry = tt.probe(key)
+        if entry is not None:
+            hash_move = entry[3]
+        if entry is not None and entry[0] >= depth:
+            _, bound, stored, _ = entry
+            score = stored * sign
+            if bound != EXACT and sign < 0:
+                bound = UPPER if bound == LOWER else LOWER
+            if bound == EXACT:
+                return score
+            if bound == LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if beta <= alpha:
+                return score
+    alpha_orig, beta_orig = alpha, beta
+
+    all_moves, in_check, game_state = expand(board, current_color)
     opponent_color = 'b' if current_color == 'w' else 'w'
 
     if depth == 0 or game_state:
-        return heuristic_function(board, player_color, opponent_color, game_state)
-    all_moves = []
-    for r in range(board.height):
-        for c in range(board.width):
-            piece = board.get_piece(r, c)
-            if piece and piece[0] == current_color:
-                legal_moves = get_legal_moves(board, r, c)
-                for move in legal_moves:
-                    all_moves.append(((r, c), move))
+        if game_state:
+            score = heuristic_function(board, player_color, opponent_color, game_state)
+        else:
+            score = quiescence(board, alpha, beta, is_maximizing, player_color, current_color, context, ply)
+        if tt is not None:
+            store_result(tt, key, depth, score, alpha_orig, beta_orig, sign, None)
+        return score
+    if context is not None:
+        context.expanded += 1
+        all_moves = context.orderer.order(board, all_moves, hash_move, ply)
     
+    best_move = None
     if is_maximizing:
         max_eval = float('-inf')
-        for start, end in all_moves:
+        for index, (start, end) in enumerate(all_moves):
             captured_piece, was_promoted, original_piece = board.make_move(start, end)
-            
-            eval = minimax(board, depth - 1, alpha, beta, False, player_color, opponent_color)
-            
-            board.undo_move(start, end, captured_piece, was_promoted, original_piece)
-            max_eval = max(max_eval, eval)
+            try:
+                eval = minimax(board, depth - 1, alpha, beta, False, player_color, opponent_color, context, ply + 1)
+            finally:
+                board.undo_move(start, end, captured_piece, was_promoted, original_piece)
+            if eval > max_eval:
+                max_eval = eval
+                best_move = (start, end)
             alpha = max(alpha, eval)
             if beta <= alpha:
-                pruning_stats['cuts'] += 1
+                if context is not None:
+                    context.record_cutoff(board, (start, end), depth, ply, index)
                 break
-        return max_eval
+        result = max_eval
     else:
         min_eval = float('inf')
-        for start, end in all_moves:
+        for index, (start, end) in enumerate(all_moves):
             captured_piece, was_promoted, original_piece = board.make_move(start, end)
-            
-            eval = minimax(board, depth - 1, alpha, beta, True, player_color, opponent_color)
-            
-            board.undo_move(start, end, captured_piece, was_promoted, original_piece)
-            min_eval = min(min_eval, eval)
+            try:
+                eval = minimax(board, depth - 1, alpha, beta, True, player_color, opponent_color, context, ply + 1)
+            finally:
+                board.undo_move(start, end, captured_piece, was_promoted, original_piece)
+            if eval < min_eval:
+                min_eval = eval
+                best_move = (start, end)
             beta = min(beta, eval)
             if beta <= alpha:
-                pruning_stats['cuts'] += 1
+                if context is not None:
+                    context.record_cutoff(board, (start, end), depth, ply, index)
                 break
-        return min_eval
+        result = min_eval
+
+    if tt is not None:
+        store_result(tt, key, depth, result, alpha_orig, beta_orig, sign, best_move)
+    return result
+
+
+def store_result(tt, key, depth, score, alpha_orig, beta_orig, sign, move):
+    """Store a root-player score in the table as a side-to-move bound"""
+    if score <= alpha_orig:
+        bound = UPPER
+    elif score >= beta_orig:
+        bound = LOWER
+    else:
+        bound = EXACT
+    if sign < 0 and bound != EXACT:
+        bound = UPPER if bound == LOWER else LOWER
+    tt.store(key, depth, bound, score * sign, move)
+
+
+def get_noisy_moves(board, color):
+    """Legal captures and promotions for the given color"""
+    coords = board.tables.coords
+    noisy_squares = board.color_masks['b' if color == 'w' else 'w']
+    promotion_row = board.tables.promotion_row[color]
+    promotion_squares = ((1 << board.width) - 1) << (promotion_row * board.width)
+    pawns = board.piece_masks[color + 'pawn']
+    noisy_moves = []
+    for sq, targets in board.get_legal_move_masks(color)[0]:
+        if (pawns >> sq) & 1:
+            targets &= noisy_squares | promotion_squares
+        else:
+            targets &= noisy_squares
+        for target in iter_squares(targets):
+            noisy_moves.append((coords[sq], coords[target]))
+    return noisy_moves
+
+
+def quiescence(board, alpha, beta, is_maximizing, player_color, current_color, context=None, ply=0):
+    """
+    Resolve captures and promotions before trusting the static evaluation.
+    The side to move may "stand pat" on the static score instead of capturing.
+    """
+    if context is not None:
+        context.tick()
+
+    opponent_color = 'b' if current_color == 'w' else 'w'
+    stand_pat = heuristic_function(board, player_color, opponent_color, None, alpha, beta)
+
+    if is_maximizing:
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+    else:
+        if stand_pat <= alpha:
+            return stand_pat
+        beta = min(beta, stand_pat)
+
+    noisy_moves = get_noisy_moves(board, current_color)
+    orderer = context.orderer if context is not None else None
+    if orderer is not None:
+        noisy_moves = orderer.order(board, noisy_moves, None, ply)
+
+    best = stand_pat
+    for start, end in noisy_moves:
+        # Delta pruning: skip captures that cannot change the outcome
+        target = board.board[end[0]][end[1]]
+        gain = board.get_piece_value(target) if target else 0
+        if board.board[start[0]][start[1]][1:] == 'pawn' and end[0] in (0, board.height - 1):
+            gain += PROMOTION_GAIN
+        if is_maximizing and stand_pat + gain + DELTA_MARGIN <= alpha:
+            continue
+        if not is_maximizing and stand_pat - gain - DELTA_MARGIN >= beta:
+            continue
+
+        captured_piece, was_promoted, original_piece = board.make_move(start, end)
+        try:
+            score = quiescence(board, alpha, beta, not is_maximizing, player_color, opponent_color, context, ply + 1)
+        finally:
+            board.undo_move(start, end, captured_piece, was_promoted, original_piece)
+
+        if is_maximizing:
+            best = max(best, score)
+            alpha = max(alpha, score)
+        else:
+            best = min(best, score)
+            beta = min(beta, score)
+        if beta <= alpha:
+            break
+    return best
 
 
 def count_controlled_squares(board, color):
-    
-    controlled = set()  
-    for r in range(board.height):
-        for c in range(board.width):
-            piece = board.get_piece(r, c)
-            if piece and piece[0] == color:
-                for move in board.get_valid_moves(r, c):
-                    controlled.add(move) 
-    
-    return len(controlled)
+    return board.get_attack_map().controlled[color].bit_count()
 
 
 def evaluate_space_control(board, color):
@@ -170,7 +498,14 @@ def evaluate_space_control(board, color):
     return (player_control - opponent_control) * 0.1
 
 
-def heuristic_function(board, player_color, opponent_color, game_state):
+# Largest possible size of the mobility and space terms: at most every
+# piece (10) for mobility and every square (30) for space control.
+# When material alone is further than this outside the search window the
+# attack map is not needed at all.
+LAZY_EVAL_MARGIN = 10 * 0.1 + 0.2 * 30 * 0.1
+
+
+def heuristic_function(board, player_color, opponent_color, game_state, alpha=None, beta=None):
     if game_state == "checkmate":
         return 1000 if opponent_color == player_color else -1000
     elif game_state in ["stalemate", "insufficient_material"]:
@@ -178,17 +513,26 @@ def heuristic_function(board, player_color, opponent_color, game_state):
 
     score=board.evaluate_board(player_color)
 
+    # Lazy evaluation: the positional terms cannot bring the score back into the window
+    if alpha is not None and score + LAZY_EVAL_MARGIN <= alpha:
+        return score + LAZY_EVAL_MARGIN
+    if beta is not None and score - LAZY_EVAL_MARGIN >= beta:
+        return score - LAZY_EVAL_MARGIN
+
+    # Mobility and space control both come from one attack map per position
+    attack_map=board.get_attack_map()
+
     WINNING_THRESHOLD=3  
     WINNING_BONUS=0.1   
     winning_prob_bonus=0
 
     if score>WINNING_THRESHOLD:
-        player_moves=len(get_all_pieces_with_moves(board,player_color))
-        opponent_moves=len(get_all_pieces_with_moves(board,opponent_color))
+        player_moves=attack_map.mobile[player_color]
+        opponent_moves=attack_map.mobile[opponent_color]
         
         winning_prob_bonus=(player_moves-opponent_moves)*WINNING_BONUS
 
     space_advantage=evaluate_space_control(board, player_color)
     space_bonus=0.2*space_advantage
 
-    return score+winning_prob_bonus+space_bonus
\ No newline at end of file
+    return score+winning_prob_bonus+space_bonus
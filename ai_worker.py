@@ -0,0 +1,129 @@
+import threading
+import time
+
+from ai import get_ai_move, get_expected_reply, get_search_budget, SearchContext
+from time_manager import TimeManager, allocate_time
+
+
+class AISearch:
+    """
+    Handle to an engine search running in a background thread, so the
+    game loop can keep drawing and handling events while the AI thinks.
+    The search works on a copy of the board; poll done() each frame,
+    read the move with result() and stop early with cancel().
+
+    With ponder_move, the search runs on the position after that move
+    (the opponent's expected reply) without a clock until ponderhit()
+    is called, at which point the normal time budget starts. The node
+    budget covers the ponder search as a whole. In timed
+    games (a time_left search option) that budget comes from the engine's
+    clock, which does not run while the opponent thinks.
+    """
+
+    def __init__(self, board, color, difficulty, ponder_move=None, **search_options):
+        self.color = color
+        self.ponder_move = ponder_move
+        self.pondering = ponder_move is not None
+        self.start_time = time.time()
+        self.depth = 0
+        self.nodes = 0
+        self._move = None
+        self._error = None
+        self._stop_event = threading.Event()
+        self._done_event = threading.Event()
+
+        position = board.copy()
+        self._timeout, self._max_nodes = get_search_budget(
+            difficulty, search_options.get('timeout'), search_options.get('max_nodes'))
+        self._context = None
+        self._time_limits = None
+        if self.pondering:
+            position.make_move(*ponder_move)
+            if search_options.get('time_left') is not None:
+                self._time_limits = allocate_time(position, search_options['time_left'],
+                                                  search_options.get('increment', 0.0))
+            # The whole ponder search shares the level's node budget, so
+            # it costs no more than a normal search; only the clock waits
+            # for ponderhit(). Pondering always runs in this process so
+            # the deadline can be changed.
+            self._context = SearchContext(None, self._max_nodes, None, self._stop_event)
+            search_options = {'context': self._context}
+
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(position, color, difficulty, search_options),
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, position, color, difficulty, search_options):
+        try:
+            self._move = get_ai_move(
+                position, color, difficulty,
+                stop_event=self._stop_event,
+                on_progress=self._on_progress,
+                **search_options
+            )
+        except Exception as error:  # Surface worker errors on result()
+            self._error = error
+        finally:
+            self._done_event.set()
+
+    def _on_progress(self, depth, nodes, best_move):
+        self.depth = depth
+        self.nodes = nodes
+
+    def ponderhit(self):
+        """
+        The opponent played the expected move: keep searching, now against
+        the clock. The node budget is not reset; pondering already spent
+        part of it.
+        """
+        if not self.pondering:
+            return
+        self.pondering = False
+        self.start_time = time.time()
+        if self._time_limits is not None:
+            soft_limit, hard_limit = self._time_limits
+            self._context.start_clock(hard_limit)
+            self._context.time_manager = TimeManager(soft_limit, hard_limit)
+        else:
+            self._context.start_clock(self._timeout)
+
+    def done(self):
+        return self._done_event.is_set()
+
+    def cancelled(self):
+        return self._stop_event.is_set()
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def result(self, timeout=None):
+        """Wait for the search (up to timeout seconds) and return its move"""
+        if not self._done_event.wait(timeout):
+            raise TimeoutError("AI search still running")
+        if self._error is not None:
+            raise self._error
+        return self._move
+
+    def cancel(self):
+        """Ask the search to stop; it unwinds within a few dozen nodes"""
+        self._stop_event.set()
+
+
+def start_ai_search(board, color, difficulty, **search_options):
+    """Start searching for color's move in the background and return its AISearch handle"""
+    return AISearch(board, color, difficulty, **search_options)
+
+
+def start_pondering(board, opponent_color, color, difficulty, **search_options):
+    """
+    While opponent_color is thinking, search color's answer to the
+    opponent's expected reply. Returns the AISearch handle, or None when
+    the engine has no expected reply to ponder on.
+    """
+    expected_reply = get_expected_reply(board, opponent_color)
+    if expected_reply is None:
+        return None
+    return AISearch(board, color, difficulty, ponder_move=expected_reply, **search_options)
@@ -0,0 +1,82 @@
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import ai
+from board import Board
+from encoding import encode_move, decode_move, pack_position
+from notation import START_FEN
+
+# Offline analysis: score every root move, not just the best one. Root
+# moves are independent, so each is searched with a full window in its
+# own pool task and the results are collected as they finish.
+
+
+def score_root_move(data, width, height, packed_move, depth):
+    """
+    Full-window alpha-beta score of one root move, given as a
+    Board.to_bytes snapshot and a packed move; returns
+    (packed_move, score, nodes, seconds)
+    """
+    start_time = time.time()
+    position, color = Board.from_bytes(data, width, height)
+    opponent_color = 'b' if color == 'w' else 'w'
+    context = ai.SearchContext(tt=ai.transposition_table)
+    position.make_move(*position.decode_move(packed_move))
+    score = ai.minimax(position, depth - 1, -float('inf'), float('inf'),
+                       False, color, opponent_color, context, 1)
+    return packed_move, score, context.nodes, time.time() - start_time
+
+
+def analyse_position(board, color, depth, workers=None):
+    """
+    Score all of color's legal moves to the given depth.
+    Returns [(move, score, nodes, seconds)] sorted best first. The moves
+    are spread over `workers` processes (default: one per CPU); with
+    workers=1 everything runs in this process.
+    """
+    all_pieces_with_moves = ai.get_all_pieces_with_moves(board, color)
+    root_moves = ai.get_sorted_moves(board, color, all_pieces_with_moves)
+    if not root_moves:
+        return []
+
+    ai.transposition_table.new_search()
+    args = (pack_position(board.board, board.width, board.height, color), board.width, board.height)
+    packed_moves = [encode_move(move, board.width) for move in root_moves]
+    if workers == 1:
+        results = [score_root_move(*args, move, depth) for move in packed_moves]
+    else:
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            futures = [pool.submit(score_root_move, *args, move, depth) for move in packed_moves]
+            results = [future.result() for future in as_completed(futures)]
+
+    results = [(decode_move(move, board.width), *rest) for move, *rest in results]
+    results.sort(key=lambda result: result[1], reverse=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score every move of a MiniChess position")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--color", choices=("w", "b"), default=None,
+                        help="side to move (default: the one given by --fen)")
+    parser.add_argument("--fen", default=START_FEN, help="position to analyse")
+    args = parser.parse_args()
+
+    board, color = Board.from_fen(args.fen)
+    color = args.color or color
+    start_time = time.time()
+    results = analyse_position(board, color, args.depth, args.workers)
+    elapsed = time.time() - start_time
+
+    for (start, end), score, nodes, seconds in results:
+        print(f"{start} -> {end}: score {score:+.2f} | nodes {nodes} | {seconds:.2f}s")
+    total_nodes = sum(result[2] for result in results)
+    print(f"{len(results)} moves | {total_nodes} nodes in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
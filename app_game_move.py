@@ -1,12 +1,11 @@
+from bitboard import iter_squares
 
 def find_king(board, color):
     """Find the position of the king with the given color"""
-    for r in range(board.height):
-        for c in range(board.width):
-            piece = board.get_piece(r, c)
-            if piece and piece[0] == color and 'king' in piece:
-                return (r, c)
-    return None
+    sq = board.king_square(color)
+    if sq is None:
+        return None
+    return board.tables.coords[sq]
 
 def is_in_check(board, color):
     """Check if the king of the given color is in check"""
@@ -15,18 +14,14 @@ def is_in_check(board, color):
     if not king_pos:
         return False  # No king found (shouldn't happen in a normal game)
     
-    # Check if any opponent piece can capture the king
+    # Reuse this position's attack map if evaluation already built one
+    attack_map = board.get_attack_map(cached_only=True)
+    if attack_map is not None:
+        return attack_map.is_in_check(color)
+
+    # Otherwise look outward from the king for opponent attackers
     opponent_color = 'b' if color == 'w' else 'w'
-    
-    for r in range(board.height):
-        for c in range(board.width):
-            piece = board.get_piece(r, c)
-            if piece and piece[0] == opponent_color:
-                moves = board.get_valid_moves(r, c)
-                if king_pos in moves:
-                    return True
-    
-    return False
+    return board.is_square_attacked(king_pos, opponent_color)
 
 def would_be_in_check_after_move(board, start, end, color):
     """Check if making a move would leave the king in check"""
@@ -43,59 +38,48 @@ def would_be_in_check_after_move(board, start, end, color):
 
 def get_legal_moves(board, row, col):
     """Get all legal moves for a piece (moves that don't leave the king in check)"""
-    piece = board.get_piece(row, col)
-    if not piece:
-        return []
-    
-    color = piece[0]
-    potential_moves = board.get_valid_moves(row, col)
-    legal_moves = []
-    
-    for move in potential_moves:
-        # Check if the move would leave the king in check
-        if not would_be_in_check_after_move(board, (row, col), move, color):
-            legal_moves.append(move)
-    
-    return legal_moves
+    coords = board.tables.coords
+    return [coords[sq] for sq in iter_squares(board.get_legal_move_mask(row, col))]
+
+def _moves_from_masks(board, masks):
+    """Turn [(square, destination mask)] into a list of (start, end) moves"""
+    coords = board.tables.coords
+    all_moves = []
+    for sq, targets in masks:
+        start = coords[sq]
+        for target in iter_squares(targets):
+            all_moves.append((start, coords[target]))
+    return all_moves
+
+def get_all_legal_moves(board, color):
+    """Get every legal (start, end) move for the given color in one pass"""
+    return _moves_from_masks(board, board.get_legal_move_masks(color)[0])
+
 
 
+def expand(board, color):
+    """
+    Expand a position for the side to move in a single pass.
+    Returns (legal_moves, in_check, game_state) where legal_moves is a list
+    of (start, end) moves and game_state is "checkmate", "stalemate",
+    "insufficient_material" or None.
+    """
+    # Insufficient material: nothing but the two kings is left (a bare
+    # king can never give check)
+    kings = board.piece_masks['wking'] | board.piece_masks['bking']
+    if not board.occupied & ~kings:
+        return [], False, "insufficient_material"
+
+    # The checkers come from the same legality pass that generates the moves
+    masks, checkers = board.get_legal_move_masks(color)
+    check = bool(checkers)
+    legal_moves = _moves_from_masks(board, masks)
+    if not legal_moves:
+        if check:
+            return legal_moves, check, "checkmate"  # No legal moves and king is in check
+        return legal_moves, check, "stalemate"  # No legal moves but king is not in check
+    return legal_moves, check, None
 
 def is_game_over(board, color):
     """Check if the game is over (checkmate, stalemate, or insufficient material)"""
-    # First, check for insufficient material (only kings remaining)
-    only_kings_remain = True
-    for r in range(board.height):
-        for c in range(board.width):
-            piece = board.get_piece(r, c)
-            if piece and 'king' not in piece:  # If any non-king piece is found
-                only_kings_remain = False
-                break
-        if not only_kings_remain:
-            break
-    
-    if only_kings_remain:
-        return "insufficient_material"  # Draw due to insufficient material
-    
-    # Continue with the original logic for checkmate and stalemate
-    check = is_in_check(board, color)
-    
-    # Check if there are any legal moves
-    has_legal_moves = False
-    for r in range(board.height):
-        for c in range(board.width):
-            piece = board.get_piece(r, c)
-            if piece and piece[0] == color:
-                legal_moves = get_legal_moves(board, r, c)
-                if legal_moves:
-                    has_legal_moves = True
-                    break
-        if has_legal_moves:
-            break
-    
-    if not has_legal_moves:
-        if check:
-            return "checkmate"  # No legal moves and king is in check
-        else:
-            return "stalemate"  # No legal moves but king is not in check
-    
-    return None
\ No newline at end of file
+    return expand(board, color)[2]
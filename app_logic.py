@@ -2,18 +2,18 @@
 import pygame
 import os
 import sys
-import random
-import time
 from button_navigation import create_button, select_difficulty_with_navigation
 from board import Board
+from board_view import BoardView
 from pieces import load_piece_images
 from launch_screen import create_launch_screen
 import constants as const
 from difficulty_screen import create_difficulty_screen
 from game_over_ui import draw_game_over_screen, handle_game_over_events
 
-from ai import get_ai_move
-from app_game_move import get_legal_moves, is_game_over, is_in_check
+from ai_worker import start_ai_search, start_pondering
+from app_game_move import get_legal_moves, expand
+from time_manager import GameClock
 
 def initialize_game():
     """Initialize pygame and create the game window"""
@@ -33,29 +33,43 @@ def handle_game_events():
                 return "MENU"
     return None
 
-def draw_game_screen(screen, board, piece_images, selected=None, valid_moves=None, last_move=None):
+def draw_game_screen(screen, board, view, piece_images, selected=None, valid_moves=None, last_move=None):
     """Draw all game elements on the screen"""
     screen.fill(const.BLACK)
-    board.draw(screen)
+    view.draw(screen)
     
     # Draw highlights for last move
     if last_move:
         start, end = last_move
-        board.highlight_square(screen, start[0], start[1], const.LAST_MOVE_COLOR)
-        board.highlight_square(screen, end[0], end[1], const.LAST_MOVE_COLOR)
+        view.highlight_square(screen, start[0], start[1], const.LAST_MOVE_COLOR)
+        view.highlight_square(screen, end[0], end[1], const.LAST_MOVE_COLOR)
     
     # Draw highlights for valid moves
     if valid_moves:
         for move in valid_moves:
-            board.highlight_square(screen, move[0], move[1], const.MOVE_COLOR)
+            view.highlight_square(screen, move[0], move[1], const.MOVE_COLOR)
     
     # Draw highlight for selected piece
     if selected:
-        board.highlight_square(screen, selected[0], selected[1], const.HIGHLIGHT_COLOR)
+        view.highlight_square(screen, selected[0], selected[1], const.HIGHLIGHT_COLOR)
     
-    board.draw_pieces(screen, piece_images)
+    view.draw_pieces(screen, board, piece_images)
 
-def draw_game_ui(screen, turn, game_state, ai_thinking=False, in_check=False, difficulty=None):
+def format_clock(seconds):
+    """Clock time as m:ss, with tenths under ten seconds"""
+    if seconds < 10:
+        return f"0:{seconds:04.1f}"
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}:{secs:02d}"
+
+def clock_search_options(game_clock, color):
+    """get_ai_move options for color's clock in a timed game"""
+    if game_clock is None:
+        return {}
+    return {'time_left': game_clock.remaining(color), 'increment': game_clock.increment}
+
+def draw_game_ui(screen, turn, game_state, ai_thinking=False, in_check=False, difficulty=None, ai_search=None,
+                 game_clock=None):
     """Draw UI elements like turn indicator, difficulty, and game state"""
     assets_dir = os.path.join(os.path.dirname(__file__), 'assets')
     button_font_path = os.path.join(assets_dir, 'Rosemary.ttf')
@@ -89,11 +103,29 @@ def draw_game_ui(screen, turn, game_state, ai_thinking=False, in_check=False, di
         check_y = y + (bar_height - check_text.get_height()) // 2
         screen.blit(check_text, (check_x, check_y))
 
+    # Clocks (top right)
+    if game_clock:
+        clock_font = pygame.font.SysFont("Arial", 24)
+        clock_x = const.WIDTH - 20
+        for color, name in (('b', "Black"), ('w', "White")):
+            remaining = game_clock.remaining(color)
+            clock_color = (255, 50, 50) if remaining < 10 else const.WHITE
+            clock_text = clock_font.render(f"{name} {format_clock(remaining)}", True, clock_color)
+            clock_x -= clock_text.get_width()
+            screen.blit(clock_text, (clock_x, 20))
+            clock_x -= 20
+
     # Draw game state if game is over
-    if game_state in ["checkmate", "stalemate", "insufficient_material"]:
+    if game_state in ["checkmate", "timeout", "timeout_draw", "stalemate", "insufficient_material"]:
         if game_state == "checkmate":
             state_text = "Checkmate!"
             winner = "White wins!" if turn == 'b' else "Black wins!"
+        elif game_state == "timeout":
+            state_text = "Time Out!"
+            winner = "White wins!" if turn == 'b' else "Black wins!"
+        elif game_state == "timeout_draw":
+            state_text = "Time Out!"
+            winner = "Draw!"
         elif game_state == "stalemate":
             state_text = "Stalemate!"
             winner = "Draw!"
@@ -115,19 +147,30 @@ def draw_game_ui(screen, turn, game_state, ai_thinking=False, in_check=False, di
     # AI thinking indicator
     if ai_thinking:
         thinking_font = pygame.font.SysFont("Arial", 24)
-        thinking_text = thinking_font.render("AI is thinking...", True, const.WHITE)
+        thinking_label = "AI is thinking..."
+        if ai_search and ai_search.depth:
+            thinking_label = f"AI is thinking... depth {ai_search.depth}, {ai_search.nodes} nodes"
+        thinking_text = thinking_font.render(thinking_label, True, const.WHITE)
         screen.blit(thinking_text, (20, 20))
 
 def play_game_round(screen, clock, images, difficulty, opponent):
     """Handle a complete game round with player and AI/human interaction"""
-    board = Board(const.BOARD_WIDTH, const.BOARD_HEIGHT, const.SQUARE_SIZE)
+    board = Board(const.BOARD_WIDTH, const.BOARD_HEIGHT)
+    view = BoardView(const.BOARD_WIDTH, const.BOARD_HEIGHT, const.SQUARE_SIZE)
     turn = 'w'  # White starts
     selected = None
     valid_moves = []
     last_move = None
-    game_state = None
     ai_thinking = False
-    in_check = False
+    ai_search = None  # Background search handle while the AI is thinking
+    ponder_search = None  # Background search on the player's expected reply
+    # Legal moves, check and game-over status for the side to move,
+    # recomputed once after every move instead of every frame
+    _, in_check, game_state = expand(board, turn)
+    # Chess clock for timed games; the side to move's clock is running
+    game_clock = GameClock(const.CLOCK_BASE_TIME, const.CLOCK_INCREMENT) if const.GAME_CLOCK else None
+    if game_clock:
+        game_clock.start(turn)
     
     # Determine player and AI colors based on opponent
     if opponent == "OPPONENT_AI":
@@ -141,9 +184,15 @@ def play_game_round(screen, clock, images, difficulty, opponent):
         # Handle events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                for search in (ai_search, ponder_search):
+                    if search:
+                        search.cancel()
                 return "QUIT"
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
+                    for search in (ai_search, ponder_search):
+                        if search:
+                            search.cancel()
                     return "MENU"
             
             # Handle game over events when the game is over
@@ -152,8 +201,8 @@ def play_game_round(screen, clock, images, difficulty, opponent):
                 if result:
                     return result
             
-            # Handle player input for their turn
-            if not game_state:
+            # Handle player input for their turn (the board is locked while the AI thinks)
+            if not game_state and not ai_search:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
                     pos = pygame.mouse.get_pos()
                     col = pos[0] // const.SQUARE_SIZE
@@ -168,14 +217,26 @@ def play_game_round(screen, clock, images, difficulty, opponent):
                             if (row, col) in valid_moves:
                                 # Make the move
                                 captured_piece, was_promoted, original_piece = board.make_move(selected, (row, col))
+                                if game_clock:
+                                    game_clock.press()
                                 last_move = (selected, (row, col))
-                                selected = None
-                                valid_moves = []
                                 turn = 'b' if turn == 'w' else 'w'  # Switch turns
                                 
-                                # Check if the opponent is now in check
-                                opponent_color = 'b' if turn == 'w' else 'w'
-                                in_check = is_in_check(board, opponent_color)
+                                # Check if the side to move is now in check or out of moves
+                                _, in_check, game_state = expand(board, turn)
+                                
+                                # Ponder hit: the AI keeps the search it started on this move,
+                                # unless the move ended the game
+                                if ponder_search:
+                                    if ponder_search.ponder_move == last_move and not game_state:
+                                        ponder_search.ponderhit()
+                                        ai_search = ponder_search
+                                        ai_thinking = True
+                                    else:
+                                        ponder_search.cancel()
+                                    ponder_search = None
+                                selected = None
+                                valid_moves = []
                             else:
                                 # Select a different piece or deselect
                                 if piece and piece[0] == turn:
@@ -190,36 +251,52 @@ def play_game_round(screen, clock, images, difficulty, opponent):
                                 selected = (row, col)
                                 valid_moves = get_legal_moves(board, row, col)
         
-        # AI's turn (only if opponent is AI)
-        if opponent == "OPPONENT_AI" and turn == ai_color and not game_state:
-            ai_thinking = True
-            # Draw the current state while AI is "thinking"
-            draw_game_screen(screen, board, images, selected, valid_moves, last_move)
-            draw_game_ui(screen, turn, game_state, ai_thinking, in_check, difficulty)
-            pygame.display.flip()
-            
-            # Add a small delay to make it look like the AI is thinking
-            time.sleep(0.5 + random.random() * 0.5)
-            
-            # Get AI move
-            ai_move = get_ai_move(board, ai_color, difficulty)
-            
-            if ai_move:
-                start, end = ai_move
-                captured_piece, was_promoted, original_piece = board.make_move(start, end)
-                last_move = (start, end)
-                turn = player_color  # Switch to player's turn
-                in_check = is_in_check(board, player_color)
-            
+        # Flag fall: the side to move has run out of time. It loses, unless
+        # the other side has nothing but its king left to win with
+        if game_clock and not game_state and game_clock.flagged(turn):
+            winner = 'b' if turn == 'w' else 'w'
+            if board.color_masks[winner] == board.piece_masks[winner + 'king']:
+                game_state = "timeout_draw"
+            else:
+                game_state = "timeout"
+            for search in (ai_search, ponder_search):
+                if search:
+                    search.cancel()
+            ai_search = ponder_search = None
             ai_thinking = False
+        if game_clock and game_state:
+            game_clock.stop()
         
-        # Check if game is over
-        if not game_state:
-            game_state = is_game_over(board, turn)
+        # AI's turn (only if opponent is AI): search in the background
+        # and keep rendering until the move is ready
+        if opponent == "OPPONENT_AI" and turn == ai_color and not game_state:
+            if not ai_search:
+                workers = const.AI_HARD_WORKERS if difficulty == "HARD" else 1
+                ai_search = start_ai_search(board, ai_color, difficulty, workers=workers,
+                                            **clock_search_options(game_clock, ai_color))
+                ai_thinking = True
+            elif ai_search.done() and ai_search.elapsed() >= const.AI_MIN_THINK_TIME:
+                ai_move = ai_search.result()
+                ai_search = None
+                ai_thinking = False
+                
+                if ai_move:
+                    start, end = ai_move
+                    captured_piece, was_promoted, original_piece = board.make_move(start, end)
+                    if game_clock:
+                        game_clock.press()
+                    last_move = (start, end)
+                    turn = player_color  # Switch to player's turn
+                    _, in_check, game_state = expand(board, player_color)
+                    
+                    # Use the player's think time to search the expected reply
+                    if const.AI_PONDER and not game_state:
+                        ponder_search = start_pondering(board, player_color, ai_color, difficulty,
+                                                        **clock_search_options(game_clock, ai_color))
         
         # Draw game screen
-        draw_game_screen(screen, board, images, selected, valid_moves, last_move)
-        draw_game_ui(screen, turn, game_state, ai_thinking, in_check, difficulty)
+        draw_game_screen(screen, board, view, images, selected, valid_moves, last_move)
+        draw_game_ui(screen, turn, game_state, ai_thinking, in_check, difficulty, ai_search, game_clock)
         
         # Handle game over state with navigation buttons
         if game_state:
@@ -0,0 +1,84 @@
+import argparse
+import time
+
+import ai
+from board import Board
+from transposition import TranspositionTable
+
+# Fixed-depth search over a fixed set of positions. The search is
+# deterministic, so the total node count is a signature of the search
+# itself: it changes only when pruning, ordering or evaluation change.
+# Nodes per second tracks raw speed. Run before and after a change:
+# a different signature means the search changed, a lower NPS with the
+# same signature means it only got slower.
+
+BENCH_DEPTH = 4
+BENCH_POSITIONS = [
+    "rnbqk/ppppp/5/5/PPPPP/RNBQK w",
+    "r1bqk/p1ppp/np3/1P3/2PPP/RNBQK w",
+    "rnbqk/ppppp/5/1P3/P1PPP/RNBQK b",
+    "rnb1k/1p1pp/p3q/2NP1/P1PBP/R2QK w",
+    "r1bqk/pPppp/3P1/R3n/1PP1P/1NBQK w",
+    "2b1k/rp1p1/p1n2/R2Pp/4P/1NBQK w",
+    "r1b1k/pp3/P1p2/2pqP/3Q1/RNB1K w",
+    "1rbq1/1pp1k/1pP1p/P2PP/5/RNBQK b",
+    "r1bk1/p3q/p3P/N1p1n/1PP1P/R3K w",
+    "2r1k/p2p1/P3p/1RpQq/1B2P/4K w",
+    "2k2/1p3/5/3P1/5/2K2 w",
+    "r3k/5/5/5/1P3/R3K b",
+]
+
+
+def bench_position(fen, depth):
+    """Search one position to a fixed depth from a cold table; returns (move, score, context)"""
+    board, color = Board.from_fen(fen)
+    context = ai.SearchContext(tt=TranspositionTable())
+    all_pieces_with_moves = ai.get_all_pieces_with_moves(board, color)
+    ordered_moves = ai.get_sorted_moves(board, color, all_pieces_with_moves, context.orderer)
+    move, score, _ = ai.iterative_deepening(board, color, ordered_moves, depth, context, verbose=False)
+    return move, score, context
+
+
+def run_bench(depth=BENCH_DEPTH, positions=BENCH_POSITIONS):
+    """Search every position and print per-position and total statistics; returns the total node count"""
+    total_nodes = 0
+    total_expanded = 0
+    total_cutoffs = 0
+    total_first = 0
+    total_time = 0.0
+    for index, fen in enumerate(positions, 1):
+        start_time = time.time()
+        move, score, context = bench_position(fen, depth)
+        elapsed = time.time() - start_time
+        nps = context.nodes / elapsed if elapsed > 0 else 0
+        print(f"Position {index:2}: {fen:36} | move {move} | score {score:+.2f} | nodes {context.nodes:8} | "
+              f"{elapsed:.2f}s | NPS {nps:.0f} | cutoff rate {context.cutoff_rate():.2f}")
+        total_nodes += context.nodes
+        total_expanded += context.expanded
+        total_cutoffs += context.cutoffs
+        total_first += context.first_move_cutoffs
+        total_time += elapsed
+
+    nps = total_nodes / total_time if total_time > 0 else 0
+    cutoff_rate = total_cutoffs / total_expanded if total_expanded else 0.0
+    first_move_rate = total_first / total_cutoffs if total_cutoffs else 0.0
+    print("=" * 40)
+    print(f"Depth:            {depth}")
+    print(f"Total time:       {total_time:.2f}s")
+    print(f"Nodes searched:   {total_nodes}")
+    print(f"Nodes/second:     {nps:.0f}")
+    print(f"Cutoff rate:      {cutoff_rate:.3f} ({first_move_rate:.3f} on the first move)")
+    print(f"Signature:        {total_nodes}")
+    return total_nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixed-depth search benchmark with a node-count signature")
+    parser.add_argument("--depth", type=int, default=BENCH_DEPTH)
+    parser.add_argument("--fen", action="append", help="search this position instead of the built-in suite (repeatable)")
+    args = parser.parse_args()
+    run_bench(args.depth, args.fen or BENCH_POSITIONS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+from functools import lru_cache
+
+from evaluation import get_square_scores
+from piece_types import PIECES, PIECE_VALUES
+from zobrist import PIECE_KEYS
+
+# Squares are numbered row by row: square = row * width + col, and bit
+# (1 << square) represents that square in a mask. A 5x6 board needs only
+# 30 bits, so every mask is a plain Python int.
+
+ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+BISHOP_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+KNIGHT_OFFSETS = [
+    (-2, -1), (-2, 1), (-1, -2), (-1, 2),
+    (1, -2), (1, 2), (2, -1), (2, 1)
+]
+KING_OFFSETS = [
+    (dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc
+]
+
+
+class AttackTables:
+    """Precomputed attack masks and slider rays for one board size"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.num_squares = width * height
+        self.full_mask = (1 << self.num_squares) - 1
+        self.coords = [(sq // width, sq % width) for sq in range(self.num_squares)]
+
+        self.knight = [self._step_mask(sq, KNIGHT_OFFSETS) for sq in range(self.num_squares)]
+        self.king = [self._step_mask(sq, KING_OFFSETS) for sq in range(self.num_squares)]
+        self.pawn_attacks = {
+            'w': [self._step_mask(sq, [(-1, -1), (-1, 1)]) for sq in range(self.num_squares)],
+            'b': [self._step_mask(sq, [(1, -1), (1, 1)]) for sq in range(self.num_squares)],
+        }
+        self.pawn_push = {
+            'w': [self._step_mask(sq, [(-1, 0)]) for sq in range(self.num_squares)],
+            'b': [self._step_mask(sq, [(1, 0)]) for sq in range(self.num_squares)],
+        }
+        self.pawn_double_push = {
+            'w': [self._step_mask(sq, [(-2, 0)]) for sq in range(self.num_squares)],
+            'b': [self._step_mask(sq, [(2, 0)]) for sq in range(self.num_squares)],
+        }
+        self.pawn_start_row = {'w': height - 2, 'b': 1}
+        self.promotion_row = {'w': 0, 'b': height - 1}
+
+        # Each ray is (masks by square, increasing): "increasing" rays run
+        # towards higher square numbers, so their nearest blocker is the
+        # lowest set bit; the others use the highest set bit.
+        self.rays = {d: self._ray_masks(d) for d in ROOK_DIRECTIONS + BISHOP_DIRECTIONS}
+        self.rook_rays = [(self.rays[d], d[0] * width + d[1] > 0) for d in ROOK_DIRECTIONS]
+        self.bishop_rays = [(self.rays[d], d[0] * width + d[1] > 0) for d in BISHOP_DIRECTIONS]
+        self.queen_rays = self.rook_rays + self.bishop_rays
+
+    def _on_board(self, row, col):
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def _step_mask(self, sq, offsets):
+        row, col = self.coords[sq]
+        mask = 0
+        for dr, dc in offsets:
+            nr, nc = row + dr, col + dc
+            if self._on_board(nr, nc):
+                mask |= 1 << (nr * self.width + nc)
+        return mask
+
+    def _ray_masks(self, direction):
+        dr, dc = direction
+        masks = []
+        for sq in range(self.num_squares):
+            row, col = self.coords[sq]
+            mask = 0
+            nr, nc = row + dr, col + dc
+            while self._on_board(nr, nc):
+                mask |= 1 << (nr * self.width + nc)
+                nr, nc = nr + dr, nc + dc
+            masks.append(mask)
+        return masks
+
+    def slider_attacks(self, sq, occupied, rays):
+        """Squares reached along the given rays, stopping at (and including) the first blocker"""
+        attacks = 0
+        for masks, increasing in rays:
+            ray = masks[sq]
+            blockers = ray & occupied
+            if blockers:
+                if increasing:
+                    blocker = (blockers & -blockers).bit_length() - 1
+                else:
+                    blocker = blockers.bit_length() - 1
+                ray ^= masks[blocker]
+            attacks |= ray
+        return attacks
+
+
+@lru_cache(maxsize=None)
+def get_attack_tables(width, height):
+    """Shared AttackTables for a board size (built once per size)"""
+    return AttackTables(width, height)
+
+
+def iter_squares(mask):
+    """Yield the square number of every set bit in mask"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class AttackMap:
+    """
+    Attack and mobility summary of one position, for both colors:
+    controlled  - squares the color's pieces can move to (pseudo-legal)
+    attacked    - squares the color's pieces attack, including defended own pieces
+    mobile      - number of the color's pieces with at least one pseudo-legal move
+    """
+
+    def __init__(self, position):
+        self.hash = position.hash
+        self.controlled = {}
+        self.attacked = {}
+        self.mobile = {}
+        tables = position.tables
+        occupied = position.color_masks['w'] | position.color_masks['b']
+        board = position.board
+        for color in ('w', 'b'):
+            own = position.color_masks[color]
+            enemy = occupied ^ own
+            empty = ~occupied
+            controlled = attacked = mobile = 0
+            for sq in iter_squares(own):
+                row, col = tables.coords[sq]
+                typ = board[row][col][1:]
+                if typ == 'pawn':
+                    attacks = tables.pawn_attacks[color][sq]
+                    moves = tables.pawn_push[color][sq] & empty
+                    if moves and row == tables.pawn_start_row[color]:
+                        moves |= tables.pawn_double_push[color][sq] & empty
+                    moves |= attacks & enemy
+                else:
+                    if typ == 'knight':
+                        attacks = tables.knight[sq]
+                    elif typ == 'king':
+                        attacks = tables.king[sq]
+                    elif typ == 'rook':
+                        attacks = tables.slider_attacks(sq, occupied, tables.rook_rays)
+                    elif typ == 'bishop':
+                        attacks = tables.slider_attacks(sq, occupied, tables.bishop_rays)
+                    else:
+                        attacks = tables.slider_attacks(sq, occupied, tables.queen_rays)
+                    moves = attacks & ~own
+                attacked |= attacks
+                controlled |= moves
+                if moves:
+                    mobile += 1
+            self.controlled[color] = controlled
+            self.attacked[color] = attacked
+            self.mobile[color] = mobile
+        self.kings = {color: position.piece_masks[color + 'king'] for color in ('w', 'b')}
+
+    def is_in_check(self, color):
+        opponent_color = 'b' if color == 'w' else 'w'
+        return bool(self.kings[color] & self.attacked[opponent_color])
+
+
+class BitboardPosition:
+    """
+    Chess position stored as bitboards: one mask per piece (e.g. 'wknight')
+    and one per color. The 2D `board` grid of piece names is kept alongside
+    as a mailbox for fast square lookups and for drawing.
+    """
+
+    def __init__(self, width, height, grid=None):
+        self.width = width
+        self.height = height
+        self.tables = get_attack_tables(width, height)
+        self.square_scores = get_square_scores(width, height)
+        self.load_grid(grid if grid is not None else self._init_starting_position())
+
+    def _init_starting_position(self):
+        """Initialize the chess board with pieces in starting positions"""
+        board = [[None]*self.width for _ in range(self.height)]
+        # Set up black pieces
+        board[0] = ['brook','bknight','bbishop','bqueen','bking','bbishop','bknight','brook'][:self.width]
+        board[1] = ['bpawn'] * self.width
+        # Set up white pieces
+        board[-2] = ['wpawn'] * self.width
+        board[-1] = ['wrook','wknight','wbishop','wqueen','wking','wbishop','wknight','wrook'][:self.width]
+        return board
+
+    def load_grid(self, grid):
+        """Replace the position with a 2D grid of piece names and rebuild all masks"""
+        self.board = [list(row[:self.width]) for row in grid]
+        self.piece_masks = {piece: 0 for piece in PIECES}
+        self.color_masks = {'w': 0, 'b': 0}
+        self.hash = 0  # Zobrist hash, kept in sync by make_move/undo_move
+        self.scores = {'w': 0, 'b': 0}  # Centipawn material + piece-square score per color
+        self._attack_map = None
+        for r in range(self.height):
+            for c in range(self.width):
+                piece = self.board[r][c]
+                if piece:
+                    sq = r * self.width + c
+                    self.piece_masks[piece] |= 1 << sq
+                    self.color_masks[piece[0]] |= 1 << sq
+                    self.hash ^= PIECE_KEYS[piece][r][c]
+                    self.scores[piece[0]] += self.square_scores[piece][sq]
+
+    def copy(self):
+        """Independent copy of the position"""
+        position = self.__class__.__new__(self.__class__)
+        position.width = self.width
+        position.height = self.height
+        position.tables = self.tables
+        position.square_scores = self.square_scores
+        position.board = [row[:] for row in self.board]
+        position.piece_masks = dict(self.piece_masks)
+        position.color_masks = dict(self.color_masks)
+        position.hash = self.hash
+        position.scores = dict(self.scores)
+        position._attack_map = None
+        return position
+
+    def __getstate__(self):
+        """Pickle only the position itself; shared tables are rebuilt from the per-size caches"""
+        state = self.__dict__.copy()
+        del state['tables'], state['square_scores']
+        state['_attack_map'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.tables = get_attack_tables(self.width, self.height)
+        self.square_scores = get_square_scores(self.width, self.height)
+
+    @property
+    def occupied(self):
+        return self.color_masks['w'] | self.color_masks['b']
+
+    def get_piece(self, row, col):
+        """Get the piece at a specific position"""
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return self.board[row][col]
+        return None
+
+    def make_move(self, start, end):
+        """Move a piece from start to end position and handle pawn promotion"""
+        sr, sc = start
+        er, ec = end
+        moving_piece = self.board[sr][sc]
+        captured_piece = self.board[er][ec]  # Store the captured piece
+        was_promoted = False  # Track if promotion occurred
+        original_piece = moving_piece  # Store the original piece before promotion
+        color = moving_piece[0]
+        landed_piece = moving_piece
+
+        # Pawn reaching the far row is promoted to a queen
+        if moving_piece[1:] == 'pawn' and er == self.tables.promotion_row[color]:
+            landed_piece = color + 'queen'
+            was_promoted = True
+
+        self.board[er][ec] = landed_piece
+        self.board[sr][sc] = None
+        self._apply_move(sr * self.width + sc, er * self.width + ec,
+                         moving_piece, landed_piece, captured_piece, 1)
+        return captured_piece, was_promoted, original_piece  # Return additional info for undo
+
+    def undo_move(self, start, end, captured_piece, was_promoted, original_piece):
+        """Undo a move by restoring original positions, handling pawn promotion"""
+        sr, sc = start
+        er, ec = end
+        landed_piece = self.board[er][ec]
+        self.board[sr][sc] = original_piece
+        self.board[er][ec] = captured_piece  # Restore the captured piece (or None)
+        self._apply_move(sr * self.width + sc, er * self.width + ec,
+                         original_piece, landed_piece, captured_piece, -1)
+
+    def _apply_move(self, from_sq, to_sq, moving_piece, landed_piece, captured_piece, sign):
+        """
+        Apply a move to the masks, hash and scores (sign=1), or take it back
+        (sign=-1). The mask and hash updates are XORs, so only the scores
+        need the sign.
+        """
+        from_bit = 1 << from_sq
+        to_bit = 1 << to_sq
+        masks = self.piece_masks
+        masks[moving_piece] ^= from_bit
+        masks[landed_piece] ^= to_bit
+        color = moving_piece[0]
+        self.color_masks[color] ^= from_bit | to_bit
+        square_scores = self.square_scores
+        self.scores[color] += sign * (square_scores[landed_piece][to_sq] - square_scores[moving_piece][from_sq])
+        coords = self.tables.coords
+        fr, fc = coords[from_sq]
+        tr, tc = coords[to_sq]
+        h = self.hash ^ PIECE_KEYS[moving_piece][fr][fc] ^ PIECE_KEYS[landed_piece][tr][tc]
+        if captured_piece:
+            masks[captured_piece] ^= to_bit
+            self.color_masks[captured_piece[0]] ^= to_bit
+            self.scores[captured_piece[0]] -= sign * square_scores[captured_piece][to_sq]
+            h ^= PIECE_KEYS[captured_piece][tr][tc]
+        self.hash = h
+
+    def king_square(self, color):
+        """Square number of the king of the given color, or None.
+        The king masks are updated by make_move/undo_move, so this never scans the board."""
+        mask = self.piece_masks[color + 'king']
+        return mask.bit_length() - 1 if mask else None
+
+    # Attack detection methods
+    def get_attack_map(self, cached_only=False):
+        """
+        AttackMap of the current position. The last map is cached by hash so
+        evaluation terms and check detection at the same node share it.
+        With cached_only, return None instead of building a missing map.
+        """
+        attack_map = self._attack_map
+        if attack_map is not None and attack_map.hash == self.hash:
+            return attack_map
+        if cached_only:
+            return None
+        attack_map = self._attack_map = AttackMap(self)
+        return attack_map
+
+    def attackers_to(self, sq, by_color, occupied=None):
+        """Mask of by_color pieces attacking square sq, looking outward from sq"""
+        tables = self.tables
+        masks = self.piece_masks
+        if occupied is None:
+            occupied = self.color_masks['w'] | self.color_masks['b']
+        defender = 'b' if by_color == 'w' else 'w'
+        attackers = (
+            (tables.knight[sq] & masks[by_color + 'knight'])
+            | (tables.king[sq] & masks[by_color + 'king'])
+            | (tables.pawn_attacks[defender][sq] & masks[by_color + 'pawn'])
+        )
+        queens = masks[by_color + 'queen']
+        rooks = masks[by_color + 'rook'] | queens
+        if rooks:
+            attackers |= tables.slider_attacks(sq, occupied, tables.rook_rays) & rooks
+        bishops = masks[by_color + 'bishop'] | queens
+        if bishops:
+            attackers |= tables.slider_attacks(sq, occupied, tables.bishop_rays) & bishops
+        return attackers
+
+    def is_square_attacked(self, square, by_color):
+        """Check whether any by_color piece attacks the (row, col) square"""
+        row, col = square
+        sq = row * self.width + col
+        tables = self.tables
+        masks = self.piece_masks
+        defender = 'b' if by_color == 'w' else 'w'
+        if tables.knight[sq] & masks[by_color + 'knight']:
+            return True
+        if tables.pawn_attacks[defender][sq] & masks[by_color + 'pawn']:
+            return True
+        if tables.king[sq] & masks[by_color + 'king']:
+            return True
+        occupied = self.color_masks['w'] | self.color_masks['b']
+        queens = masks[by_color + 'queen']
+        rooks = masks[by_color + 'rook'] | queens
+        if rooks and tables.slider_attacks(sq, occupied, tables.rook_rays) & rooks:
+            return True
+        bishops = masks[by_color + 'bishop'] | queens
+        if bishops and tables.slider_attacks(sq, occupied, tables.bishop_rays) & bishops:
+            return True
+        return False
+
+    # Move generation methods
+    def get_move_mask(self, row, col):
+        """Mask of pseudo-legal destination squares for the piece at given position"""
+        piece = self.get_piece(row, col)
+        if not piece:
+            return 0
+        return self._move_mask(row * self.width + col, piece)
+
+    def _move_mask(self, sq, piece):
+        tables = self.tables
+        color = piece[0]
+        typ = piece[1:]
+        own = self.color_masks[color]
+
+        if typ == 'pawn':
+            enemy = self.color_masks['b' if color == 'w' else 'w']
+            empty = ~(own | enemy)
+            moves = tables.pawn_push[color][sq] & empty
+            if moves and tables.coords[sq][0] == tables.pawn_start_row[color]:
+                moves |= tables.pawn_double_push[color][sq] & empty
+            return moves | (tables.pawn_attacks[color][sq] & enemy)
+        if typ == 'knight':
+            return tables.knight[sq] & ~own
+        if typ == 'king':
+            return tables.king[sq] & ~own
+
+        occupied = self.color_masks['w'] | self.color_masks['b']
+        if typ == 'rook':
+            rays = tables.rook_rays
+        elif typ == 'bishop':
+            rays = tables.bishop_rays
+        else:
+            rays = tables.queen_rays
+        return tables.slider_attacks(sq, occupied, rays) & ~own
+
+    def _legality_info(self, color):
+        """
+        Work out once per position what constrains the side's moves:
+        returns (king_sq, checkers, evasion_mask, pins) where evasion_mask
+        holds the squares a non-king piece may move to (everything when not
+        in check) and pins maps a pinned piece's square to the line it may
+        move along.
+        """
+        king_sq = self.king_square(color)
+        if king_sq is None:
+            return None, 0, -1, {}
+
+        tables = self.tables
+        masks = self.piece_masks
+        enemy = 'b' if color == 'w' else 'w'
+        own = self.color_masks[color]
+        occupied = own | self.color_masks[enemy]
+        checkers = self.attackers_to(king_sq, enemy, occupied)
+
+        evasion_mask = -1
+        if checkers:
+            # A single checker can be captured or, if it slides, blocked
+            evasion_mask = checkers
+            for ray_masks, increasing in tables.queen_rays:
+                ray = ray_masks[king_sq]
+                if ray & checkers:
+                    checker_sq = checkers.bit_length() - 1
+                    evasion_mask = ray & ~ray_masks[checker_sq]
+                    break
+
+        pins = {}
+        queens = masks[enemy + 'queen']
+        for rays, sliders in ((tables.rook_rays, masks[enemy + 'rook'] | queens),
+                              (tables.bishop_rays, masks[enemy + 'bishop'] | queens)):
+            if not sliders:
+                continue
+            for ray_masks, increasing in rays:
+                ray = ray_masks[king_sq]
+                blockers = ray & occupied
+                if not blockers:
+                    continue
+                first = (blockers & -blockers).bit_length() - 1 if increasing else blockers.bit_length() - 1
+                if not (own >> first) & 1:
+                    continue
+                blockers = ray_masks[first] & occupied
+                if not blockers:
+                    continue
+                second = (blockers & -blockers).bit_length() - 1 if increasing else blockers.bit_length() - 1
+                if (sliders >> second) & 1:
+                    pins[first] = ray & ~ray_masks[second]
+        return king_sq, checkers, evasion_mask, pins
+
+    def _king_move_mask(self, king_sq, color):
+        """Destinations of the king that are not attacked once it has moved"""
+        enemy = 'b' if color == 'w' else 'w'
+        occupied = (self.color_masks['w'] | self.color_masks['b']) ^ (1 << king_sq)
+        legal = 0
+        for target in iter_squares(self.tables.king[king_sq] & ~self.color_masks[color]):
+            if not self.attackers_to(target, enemy, occupied):
+                legal |= 1 << target
+        return legal
+
+    def _legal_mask(self, sq, piece, info):
+        king_sq, checkers, evasion_mask, pins = info
+        if sq == king_sq:
+            return self._king_move_mask(sq, piece[0])
+        if checkers & (checkers - 1):
+            return 0  # Double check: only the king can move
+        targets = self._move_mask(sq, piece) & evasion_mask
+        if sq in pins:
+            targets &= pins[sq]
+        return targets
+
+    def get_legal_move_mask(self, row, col):
+        """Mask of destinations for the piece at (row, col) that do not leave its king in check"""
+        piece = self.get_piece(row, col)
+        if not piece:
+            return 0
+        return self._legal_mask(row * self.width + col, piece, self._legality_info(piece[0]))
+
+    def get_legal_move_masks(self, color):
+        """
+        Return ([(square, destination mask)], checkers): every piece of color
+        that has a legal move, and the mask of enemy pieces giving check.
+        """
+        info = self._legality_info(color)
+        board = self.board
+        coords = self.tables.coords
+        result = []
+        for sq in iter_squares(self.color_masks[color]):
+            row, col = coords[sq]
+            targets = self._legal_mask(sq, board[row][col], info)
+            if targets:
+                result.append((sq, targets))
+        return result, info[1]
+
+    def get_valid_moves(self, row, col):
+        """Get all valid moves for the piece at given position"""
+        piece = self.get_piece(row, col)
+        if not piece:
+            return []
+        coords = self.tables.coords
+        return [coords[sq] for sq in iter_squares(self._move_mask(row * self.width + col, piece))]
+
+    def _is_valid_position(self, row, col):
+        """Check if position is within board bounds"""
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def get_all_moves(self, color):
+        """Get all possible moves for pieces of given color"""
+        all_moves = []
+        coords = self.tables.coords
+        for sq in iter_squares(self.color_masks[color]):
+            row, col = coords[sq]
+            for target in iter_squares(self._move_mask(sq, self.board[row][col])):
+                all_moves.append(((row, col), coords[target]))
+        return all_moves
+
+    # Evaluation methods
+    def get_piece_value(self, piece_type):
+        """Get the value of a chess piece"""
+        return PIECE_VALUES.get(piece_type[1:], 0)
+
+    def evaluate_board(self, color):
+        """Evaluate the board position for the given color (material and piece placement, in pawns)"""
+        opponent_color = 'b' if color == 'w' else 'w'
+        return (self.scores[color] - self.scores[opponent_color]) / 100
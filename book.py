@@ -0,0 +1,165 @@
+import argparse
+import multiprocessing
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from analysis import score_root_move
+from app_game_move import get_all_legal_moves
+from board import Board
+from encoding import encode_move, decode_move, pack_position
+from notation import START_FEN
+from zobrist import position_key
+
+# Opening book: the engine's moves for the first few plies, searched
+# deeply once offline instead of at the start of every game.
+#
+# File layout: a header (magic, version, board width and height, entry
+# count) followed by fixed-size entries sorted by key. Each entry is a
+# position key (zobrist.position_key, so the side to move is included),
+# a packed move (see encoding.py) and a weight; a position has one entry
+# per book move. Moves are picked at random in proportion to weight.
+
+BOOK_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'opening_book.bin')
+BOOK_MAGIC = b'MCBK'
+BOOK_VERSION = 1
+HEADER = struct.Struct('<4sBBBxI')
+ENTRY = struct.Struct('<QHH')
+
+BOOK_PLIES = 6  # Depth of the opening tree covered by the book
+BOOK_DEPTH = 5  # Search depth used to score every book candidate
+BOOK_WIDTH = 3  # Most moves kept (and expanded) per position
+BOOK_MARGIN = 0.3  # Keep moves at most this many pawns worse than the best
+WEIGHT_HALF_LIFE = 0.1  # Pawns of score loss that halve a move's weight
+MAX_WEIGHT = 1000
+
+
+def save_book(book, path, width, height):
+    """Write {key: [(packed_move, weight)]} to path in the binary book format"""
+    entries = sorted((key, move, weight) for key, moves in book.items() for move, weight in moves)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(BOOK_MAGIC, BOOK_VERSION, width, height, len(entries)))
+        for entry in entries:
+            file.write(ENTRY.pack(*entry))
+
+
+def load_book(path):
+    """Read a book file into (width, height, {key: [(packed_move, weight)]})"""
+    with open(path, 'rb') as file:
+        data = file.read()
+    magic, version, width, height, count = HEADER.unpack_from(data)
+    if magic != BOOK_MAGIC or version != BOOK_VERSION:
+        raise ValueError(f"{path} is not a version {BOOK_VERSION} opening book")
+    book = {}
+    for key, move, weight in ENTRY.iter_unpack(data[HEADER.size:HEADER.size + count * ENTRY.size]):
+        book.setdefault(key, []).append((move, weight))
+    return width, height, book
+
+
+_book = None  # (width, height, entries), loaded on first probe
+
+
+def get_book():
+    """The default book from BOOK_PATH, or None when there is no (valid) book file"""
+    global _book
+    if _book is None:
+        try:
+            _book = load_book(BOOK_PATH)
+        except (OSError, ValueError, struct.error):
+            _book = (0, 0, {})
+    return _book if _book[2] else None
+
+
+def probe_book(board, color, book=None):
+    """A book move for color, chosen at random by weight, or None if the position is not in the book"""
+    book = book or get_book()
+    if book is None:
+        return None
+    width, height, entries = book
+    if (board.width, board.height) != (width, height):
+        return None
+    moves = entries.get(position_key(board, color))
+    if not moves:
+        return None
+    move = decode_move(random.choices([m for m, _ in moves], [w for _, w in moves])[0], width)
+    # Guard against hash collisions and stale books
+    if move not in get_all_legal_moves(board, color):
+        return None
+    return move
+
+
+def move_weight(score_loss):
+    """Book weight of a move scoring score_loss pawns below the best one"""
+    return max(1, round(MAX_WEIGHT * 0.5 ** (score_loss / WEIGHT_HALF_LIFE)))
+
+
+def build_book(plies=BOOK_PLIES, depth=BOOK_DEPTH, width=BOOK_WIDTH, margin=BOOK_MARGIN,
+               workers=None, start_fen=START_FEN):
+    """
+    Search the opening tree from start_fen ply by ply. Every legal move
+    of a position is scored to depth in the process pool; the best
+    `width` moves within `margin` of the best go into the book, and the
+    positions after them are searched at the next ply.
+    Returns {key: [(packed_move, weight)]}.
+    """
+    board, color = Board.from_fen(start_fen)
+    book = {}
+    frontier = [(board, color)]
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+        for ply in range(plies):
+            start_time = time.time()
+            tasks = []
+            for position, side in frontier:
+                key = position_key(position, side)
+                if key in book:
+                    continue  # Transposition of a position already in the book
+                book[key] = []
+                data = pack_position(position.board, position.width, position.height, side)
+                futures = [pool.submit(score_root_move, data, position.width, position.height,
+                                       encode_move(move, position.width), depth)
+                           for move in get_all_legal_moves(position, side)]
+                tasks.append((key, position, side, futures))
+
+            frontier = []
+            for key, position, side, futures in tasks:
+                scored = sorted((future.result()[:2] for future in futures),
+                                key=lambda result: result[1], reverse=True)
+                if not scored:
+                    del book[key]
+                    continue
+                best_score = scored[0][1]
+                kept = [(move, score) for move, score in scored[:width] if best_score - score <= margin]
+                book[key] = [(move, move_weight(best_score - score)) for move, score in kept]
+                opponent_color = 'b' if side == 'w' else 'w'
+                for move, _ in kept:
+                    child = position.copy()
+                    child.make_move(*decode_move(move, position.width))
+                    frontier.append((child, opponent_color))
+            print(f"Ply {ply + 1}: {len(tasks)} positions searched in {time.time() - start_time:.1f}s | "
+                  f"{len(book)} in book")
+    return book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the MiniChess opening book")
+    parser.add_argument("--plies", type=int, default=BOOK_PLIES)
+    parser.add_argument("--depth", type=int, default=BOOK_DEPTH)
+    parser.add_argument("--width", type=int, default=BOOK_WIDTH)
+    parser.add_argument("--margin", type=float, default=BOOK_MARGIN)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--fen", default=START_FEN, help="position the book starts from")
+    parser.add_argument("--output", default=BOOK_PATH)
+    args = parser.parse_args()
+
+    book = build_book(args.plies, args.depth, args.width, args.margin, args.workers, args.fen)
+    board, _ = Board.from_fen(args.fen)
+    save_book(book, args.output, board.width, board.height)
+    entries = sum(len(moves) for moves in book.values())
+    print(f"Wrote {len(book)} positions ({entries} moves) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,12 @@ UI_HEIGHT = 60
 WIDTH = BOARD_WIDTH * SQUARE_SIZE
 HEIGHT = BOARD_HEIGHT * SQUARE_SIZE + UI_HEIGHT
 FPS = 120
+AI_MIN_THINK_TIME = 0.5  # Seconds the AI appears to think before its move is played
+AI_PONDER = True  # Search the expected reply during the player's turn
+AI_HARD_WORKERS = 4  # Search processes for HARD (1 = single process)
+GAME_CLOCK = False  # Play with a chess clock (untimed games by default)
+CLOCK_BASE_TIME = 180  # Seconds on each side's clock at the start
+CLOCK_INCREMENT = 2  # Seconds added to a side's clock after each of its moves
 
 # Colors
 WHITE = (255, 255, 255)
@@ -0,0 +1,70 @@
+from bitboard import PIECES
+
+# Compact formats for shipping positions and moves between processes and
+# storing them on disk.
+#
+# A move is one int: bits 0-5 the from square, bits 6-11 the to square
+# (square = row * width + col) and bit 12 set when the move promotes.
+#
+# A position is a fixed-size byte string: one 4-bit piece code per square,
+# two squares per byte (low nibble first), then one byte for the side to
+# move. A 5x6 board packs into 15 + 1 = 16 bytes.
+
+SQUARE_BITS = 6
+SQUARE_MASK = (1 << SQUARE_BITS) - 1
+PROMOTION_FLAG = 1 << (2 * SQUARE_BITS)
+
+EMPTY_CODE = 0
+PIECE_CODES = {piece: code for code, piece in enumerate(PIECES, 1)}
+CODE_PIECES = [None] + PIECES
+SIDE_CODES = {'w': 0, 'b': 1}
+CODE_SIDES = ('w', 'b')
+
+
+def encode_move(move, width, promotion=False):
+    """Pack ((sr, sc), (er, ec)) into one int"""
+    (sr, sc), (er, ec) = move
+    code = (sr * width + sc) | (er * width + ec) << SQUARE_BITS
+    if promotion:
+        code |= PROMOTION_FLAG
+    return code
+
+
+def decode_move(code, width):
+    """Inverse of encode_move: ((sr, sc), (er, ec)); the promotion flag is implied by the position"""
+    sr, sc = divmod(code & SQUARE_MASK, width)
+    er, ec = divmod((code >> SQUARE_BITS) & SQUARE_MASK, width)
+    return (sr, sc), (er, ec)
+
+
+def is_promotion(code):
+    return bool(code & PROMOTION_FLAG)
+
+
+def packed_size(width, height):
+    """Bytes used by pack_position for a board of this size"""
+    return (width * height + 1) // 2 + 1
+
+
+def pack_position(grid, width, height, color):
+    """Pack a grid of piece names and the side to move into bytes"""
+    codes = [PIECE_CODES[piece] if piece else EMPTY_CODE
+             for row in grid[:height] for piece in row[:width]]
+    if len(codes) % 2:
+        codes.append(EMPTY_CODE)
+    data = bytearray(codes[i] | codes[i + 1] << 4 for i in range(0, len(codes), 2))
+    data.append(SIDE_CODES[color])
+    return bytes(data)
+
+
+def unpack_position(data, width, height):
+    """Inverse of pack_position: (grid, color)"""
+    if len(data) != packed_size(width, height):
+        raise ValueError(f"Expected {packed_size(width, height)} bytes for a {width}x{height} board, "
+                         f"got {len(data)}")
+    pieces = []
+    for byte in data[:-1]:
+        pieces.append(CODE_PIECES[byte & 0xF])
+        pieces.append(CODE_PIECES[byte >> 4])
+    grid = [pieces[r * width:(r + 1) * width] for r in range(height)]
+    return grid, CODE_SIDES[data[-1]]
@@ -0,0 +1,90 @@
+from functools import lru_cache
+
+from piece_types import PIECE_VALUES
+
+# Evaluation terms kept incrementally by BitboardPosition. Everything is in
+# centipawns (integers) so that adding and removing pieces in make_move and
+# undo_move never drifts; evaluate_board converts back to pawn units.
+
+PIECE_CENTIPAWNS = {typ: value * 100 for typ, value in PIECE_VALUES.items()}
+
+# Piece-square tables for the 5x6 board, written from White's side:
+# row 0 is the promotion row and row 5 White's back rank. Black uses the
+# vertically mirrored table.
+PIECE_SQUARE_TABLES = {
+    # Promotion proximity: the closer a pawn gets to the far row the more it is worth
+    'pawn': [
+        [  0,   0,   0,   0,   0],
+        [ 60,  60,  60,  60,  60],
+        [ 30,  35,  35,  35,  30],
+        [ 10,  15,  20,  15,  10],
+        [  0,   0,   0,   0,   0],
+        [  0,   0,   0,   0,   0],
+    ],
+    'knight': [
+        [-20, -10, -10, -10, -20],
+        [-10,   5,  10,   5, -10],
+        [-10,  10,  15,  10, -10],
+        [-10,  10,  15,  10, -10],
+        [-10,   5,  10,   5, -10],
+        [-20, -10, -10, -10, -20],
+    ],
+    'bishop': [
+        [-10,  -5,  -5,  -5, -10],
+        [ -5,   5,   5,   5,  -5],
+        [ -5,   5,  10,   5,  -5],
+        [ -5,   5,  10,   5,  -5],
+        [ -5,   5,   5,   5,  -5],
+        [-10,  -5,  -5,  -5, -10],
+    ],
+    'rook': [
+        [  0,   0,   0,   0,   0],
+        [  5,  10,  10,  10,   5],
+        [  0,   0,   0,   0,   0],
+        [  0,   0,   0,   0,   0],
+        [  0,   0,   0,   0,   0],
+        [  0,   0,   5,   0,   0],
+    ],
+    'queen': [
+        [ -5,   0,   0,   0,  -5],
+        [  0,   5,   5,   5,   0],
+        [  0,   5,   5,   5,   0],
+        [  0,   5,   5,   5,   0],
+        [  0,   0,   5,   0,   0],
+        [ -5,   0,   0,   0,  -5],
+    ],
+    # Keep the king behind its pawns
+    'king': [
+        [-30, -30, -30, -30, -30],
+        [-30, -30, -30, -30, -30],
+        [-20, -20, -20, -20, -20],
+        [-10, -10, -10, -10, -10],
+        [  0,   0,   0,   0,   0],
+        [ 10,  10,   5,  10,  10],
+    ],
+}
+TABLE_WIDTH = 5
+TABLE_HEIGHT = 6
+
+
+@lru_cache(maxsize=None)
+def get_square_scores(width, height):
+    """
+    Per piece name, the list of centipawn scores (material plus
+    piece-square bonus) indexed by square number. Boards of another size
+    get material only.
+    """
+    use_tables = (width, height) == (TABLE_WIDTH, TABLE_HEIGHT)
+    scores = {}
+    for typ, value in PIECE_CENTIPAWNS.items():
+        table = PIECE_SQUARE_TABLES[typ]
+        for color in ('w', 'b'):
+            squares = []
+            for sq in range(width * height):
+                row, col = divmod(sq, width)
+                bonus = 0
+                if use_tables:
+                    bonus = table[row if color == 'w' else height - 1 - row][col]
+                squares.append(value + bonus)
+            scores[color + typ] = squares
+    return scores
@@ -58,7 +58,7 @@ def draw_game_over_screen(screen, game_state, turn, sounds=None, play_sound=True
     
     Args:
         screen: The pygame screen to draw on
-        game_state: "checkmate" or "stalemate"
+        game_state: "checkmate", "timeout", "timeout_draw" or "stalemate"
         turn: Current turn ('w' or 'b')
         sounds: Dictionary containing sound assets (optional)
         play_sound: Whether to play the game over sound (default: True)
@@ -97,6 +97,15 @@ def draw_game_over_screen(screen, game_state, turn, sounds=None, play_sound=True
         winner = "White" if turn == 'b' else "Black"
         subtitle_text = f"{winner} Wins!"
         title_color = const.GOLD  # Use GOLD constant for consistency
+    elif game_state == "timeout":
+        title_text = "Time Out!"
+        winner = "White" if turn == 'b' else "Black"
+        subtitle_text = f"{winner} Wins!"
+        title_color = const.GOLD
+    elif game_state == "timeout_draw":
+        title_text = "Time Out!"
+        subtitle_text = "Draw!"
+        title_color = const.SILVER
     else:  # stalemate
         title_text = "Stalemate!"
         subtitle_text = "Draw!"
@@ -5,7 +5,8 @@ import sys
 # import os
 # sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app_logic import run_game_application
-
 if __name__ == "__main__":
+    # Imported here so that spawned search workers, which re-import this
+    # module as __mp_main__, never load pygame
+    from app_logic import run_game_application
     run_game_application()
\ No newline at end of file
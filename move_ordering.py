@@ -0,0 +1,57 @@
+from piece_types import PIECE_VALUES
+
+# Ordering scores: the hash move is tried first, then captures (most
+# valuable victim / least valuable attacker), promotions, killer moves
+# and finally quiet moves ranked by the history heuristic.
+HASH_MOVE_SCORE = 1_000_000
+CAPTURE_SCORE = 100_000
+PROMOTION_SCORE = 90_000
+KILLER_SCORES = (80_000, 79_000)
+
+MAX_PLY = 64
+
+
+class MoveOrderer:
+    """Killer and history tables for one search, plus the move scoring they feed"""
+
+    def __init__(self, max_ply=MAX_PLY):
+        self.max_ply = max_ply
+        self.killers = [[None, None] for _ in range(max_ply)]
+        self.history = {}
+
+    def score_move(self, board, move, hash_move=None, ply=0):
+        """Cheap ordering score for a (start, end) move; no make/undo needed"""
+        if move == hash_move:
+            return HASH_MOVE_SCORE
+        (sr, sc), (er, ec) = move
+        piece = board.board[sr][sc]
+        target = board.board[er][ec]
+        if target:
+            return CAPTURE_SCORE + 10 * PIECE_VALUES[target[1:]] - PIECE_VALUES[piece[1:]]
+        if piece[1:] == 'pawn' and (er == 0 or er == board.height - 1):
+            return PROMOTION_SCORE
+        if ply < self.max_ply:
+            killers = self.killers[ply]
+            if move == killers[0]:
+                return KILLER_SCORES[0]
+            if move == killers[1]:
+                return KILLER_SCORES[1]
+        return min(self.history.get((piece, move[1]), 0), KILLER_SCORES[1] - 1)
+
+    def order(self, board, moves, hash_move=None, ply=0):
+        """Return moves sorted best-first"""
+        return sorted(moves, key=lambda move: self.score_move(board, move, hash_move, ply), reverse=True)
+
+    def record_cutoff(self, board, move, depth, ply):
+        """Remember a quiet move that caused a beta cutoff (call with the move undone)"""
+        (sr, sc), (er, ec) = move
+        if board.board[er][ec]:
+            return  # Captures are already ordered by MVV-LVA
+        piece = board.board[sr][sc]
+        key = (piece, move[1])
+        self.history[key] = self.history.get(key, 0) + depth * depth
+        if ply < self.max_ply:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
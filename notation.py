@@ -0,0 +1,72 @@
+# FEN-style text notation for minichess positions. Rows are listed from
+# row 0 (Black's back rank) down to White's back rank, separated by '/'.
+# White pieces are upper case and Black lower case (P N B R Q K), and a
+# digit counts empty squares. The side to move follows after a space:
+#
+#   rnbqk/ppppp/5/5/PPPPP/RNBQK w
+#
+# There is no castling, en passant or move counter field: the variant
+# has none of those rules.
+
+START_FEN = "rnbqk/ppppp/5/5/PPPPP/RNBQK w"
+
+PIECE_LETTERS = {
+    'pawn': 'p', 'knight': 'n', 'bishop': 'b',
+    'rook': 'r', 'queen': 'q', 'king': 'k'
+}
+LETTER_PIECES = {}
+for _typ, _letter in PIECE_LETTERS.items():
+    LETTER_PIECES[_letter.upper()] = 'w' + _typ
+    LETTER_PIECES[_letter] = 'b' + _typ
+PIECE_CHARS = {piece: letter for letter, piece in LETTER_PIECES.items()}
+MAX_SIZE = 8  # Zobrist keys cover boards up to 8x8
+
+
+def parse_fen(fen):
+    """Parse a position into (grid, width, height, color); raises ValueError on bad input"""
+    fields = fen.split()
+    if len(fields) not in (1, 2):
+        raise ValueError(f"Expected '<rows> [w|b]', got {fen!r}")
+    color = fields[1] if len(fields) == 2 else 'w'
+    if color not in ('w', 'b'):
+        raise ValueError(f"Side to move must be 'w' or 'b', got {color!r}")
+
+    grid = []
+    for text in fields[0].split('/'):
+        row = []
+        for char in text:
+            if char.isdigit():
+                row.extend([None] * int(char))
+            elif char in LETTER_PIECES:
+                row.append(LETTER_PIECES[char])
+            else:
+                raise ValueError(f"Unknown piece {char!r} in {fen!r}")
+        grid.append(row)
+
+    width = len(grid[0])
+    height = len(grid)
+    if any(len(row) != width for row in grid):
+        raise ValueError(f"Rows of different lengths in {fen!r}")
+    if not (0 < width <= MAX_SIZE and 0 < height <= MAX_SIZE):
+        raise ValueError(f"Board must be between 1x1 and {MAX_SIZE}x{MAX_SIZE}, got {width}x{height}")
+    return grid, width, height, color
+
+
+def format_fen(grid, color):
+    """Inverse of parse_fen"""
+    rows = []
+    for row in grid:
+        text = ''
+        empty = 0
+        for piece in row:
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                text += str(empty)
+                empty = 0
+            text += PIECE_CHARS[piece]
+        if empty:
+            text += str(empty)
+        rows.append(text)
+    return '/'.join(rows) + ' ' + color
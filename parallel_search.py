@@ -0,0 +1,152 @@
+import atexit
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import ai
+from board import Board
+from encoding import decode_move, pack_position
+from transposition import SharedTranspositionTable, DEFAULT_SHARED_SIZE
+from time_manager import TimeManager
+
+# Lazy SMP: every worker process runs its own iterative deepening search
+# of the same root. Helpers try the root moves in a different order and
+# every other helper searches one ply deeper, so together they cover
+# more of the tree than one search in the same wall-clock time. The
+# deepest completed result wins. All workers share one transposition
+# table in shared memory, which is how they learn from each other.
+
+STOP_GRACE = 0.5  # Extra seconds the driver waits past the time budget
+POLL_INTERVAL = 0.05
+
+_pool = None
+_pool_workers = 0
+_stop_event = None  # multiprocessing.Event shared with every pool process
+_shared_tt = None  # Created by the driver process, attached by each worker
+shared_tt_size = DEFAULT_SHARED_SIZE  # Slots in the shared table (16 bytes each)
+
+
+def _init_worker(stop_event, tt_name):
+    global _stop_event, _shared_tt
+    _stop_event = stop_event
+    _shared_tt = SharedTranspositionTable.attach(tt_name)
+
+
+def get_pool(workers):
+    """The persistent worker pool, (re)started with the given number of processes"""
+    global _pool, _pool_workers, _stop_event, _shared_tt
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _shared_tt = SharedTranspositionTable(shared_tt_size)
+        # Spawn rather than fork: the game process has a display and threads
+        mp_context = multiprocessing.get_context("spawn")
+        _stop_event = mp_context.Event()
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                    initializer=_init_worker,
+                                    initargs=(_stop_event, _shared_tt.name))
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_workers, _shared_tt
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+    if _shared_tt is not None:
+        _shared_tt.close()
+    _pool = None
+    _pool_workers = 0
+    _shared_tt = None
+
+
+atexit.register(shutdown_pool)
+
+
+def get_shared_transposition_table():
+    """The workers' shared table, or None while no pool is running"""
+    return _shared_tt
+
+
+def set_shared_transposition_table_size(entries):
+    """Resize the workers' shared table; the pool restarts on its next use"""
+    global shared_tt_size
+    shared_tt_size = entries
+    shutdown_pool()
+
+
+def _search_worker(data, width, height, max_depth, timeout, max_nodes, worker_id, soft_limit=None):
+    """
+    One Lazy SMP search inside a pool process, on a Board.to_bytes
+    snapshot. Only the main search (worker 0) follows the soft time
+    limit; the helpers stop when it finishes.
+    """
+    position, color = Board.from_bytes(data, width, height)
+    tt = _shared_tt
+    tt.new_search()
+    context = ai.SearchContext(timeout, max_nodes, tt, _stop_event)
+    if soft_limit is not None and worker_id == 0:
+        context.time_manager = TimeManager(soft_limit, timeout)
+    all_pieces_with_moves = ai.get_all_pieces_with_moves(position, color)
+    ordered_moves = ai.get_sorted_moves(position, color, all_pieces_with_moves, context.orderer)
+
+    start_depth = 1
+    if worker_id > 0:
+        # Keep the best-guess move first but shuffle the rest
+        rest = ordered_moves[1:]
+        random.Random(worker_id).shuffle(rest)
+        ordered_moves[1:] = rest
+        if worker_id % 2:
+            start_depth = 2
+            max_depth += 1
+
+    move, score, depth = ai.iterative_deepening(
+        position, color, ordered_moves, max_depth, context, start_depth, verbose=False)
+    packed_move = position.encode_move(move) if move is not None else None
+    return worker_id, packed_move, score, depth, context.nodes
+
+
+def get_parallel_ai_move(board, color, difficulty, workers, timeout=None,
+                         max_nodes=None, stop_event=None, on_progress=None, verbose=True,
+                         soft_limit=None):
+    """Lazy SMP version of ai.get_ai_move using a pool of worker processes"""
+    start_time = time.time()
+    if not ai.get_all_pieces_with_moves(board, color):
+        return None
+
+    timeout, max_nodes = ai.get_search_budget(difficulty, timeout, max_nodes)
+    max_depth = ai.MAX_SEARCH_DEPTH
+    pool = get_pool(workers)
+    _shared_tt.new_search()
+    _stop_event.clear()
+    data = pack_position(board.board, board.width, board.height, color)
+    futures = [
+        pool.submit(_search_worker, data, board.width, board.height,
+                    max_depth, timeout, max_nodes, worker_id, soft_limit)
+        for worker_id in range(workers)
+    ]
+    main_future = futures[0]
+
+    deadline = start_time + timeout + STOP_GRACE if timeout is not None else None
+    pending = set(futures)
+    while pending:
+        _, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        # Once the main search is done the helpers have nothing left to add
+        if (main_future.done()
+                or (stop_event is not None and stop_event.is_set())
+                or (deadline is not None and time.time() >= deadline)):
+            _stop_event.set()
+
+    results = sorted((future.result() for future in futures),
+                     key=lambda result: (-result[3], result[0]))
+    worker_id, packed_move, best_score, depth, _ = results[0]
+    best_move = decode_move(packed_move, board.width) if packed_move is not None else None
+    nodes = sum(result[4] for result in results)
+    if on_progress is not None:
+        on_progress(depth, nodes, best_move)
+
+    if verbose:
+        elapsed = time.time() - start_time
+        print(f"Move found in {elapsed:.2f}s | Workers: {workers} | Depth: {depth} (worker {worker_id}) | "
+              f"Nodes: {nodes} | Score: {best_score}")
+    return best_move
@@ -0,0 +1,143 @@
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app_game_move import get_all_legal_moves, would_be_in_check_after_move
+from bitboard import iter_squares
+from board import Board
+from encoding import encode_move, decode_move, pack_position
+from notation import START_FEN
+from zobrist import position_key
+
+# Perft: count the leaf nodes of the legal move tree to a fixed depth.
+# Known counts make it a correctness check for move generation, and the
+# time taken a throughput benchmark for it. Game-over rules other than
+# "no legal moves" (e.g. bare kings) are ignored, as is usual for perft.
+
+
+def perft(board, color, depth, table=None):
+    """
+    Leaf nodes of the legal move tree below this position. With a dict as
+    table, subtree counts are cached by position and depth so
+    transpositions are only counted once.
+    """
+    if depth == 0:
+        return 1
+    if table is not None:
+        key = (position_key(board, color), depth)
+        if key in table:
+            return table[key]
+
+    masks = board.get_legal_move_masks(color)[0]
+    if depth == 1:
+        # Bulk counting: the leaves are just the legal moves
+        nodes = sum(targets.bit_count() for _, targets in masks)
+    else:
+        opponent_color = 'b' if color == 'w' else 'w'
+        coords = board.tables.coords
+        nodes = 0
+        for sq, targets in masks:
+            start = coords[sq]
+            for target in iter_squares(targets):
+                end = coords[target]
+                undo_info = board.make_move(start, end)
+                try:
+                    nodes += perft(board, opponent_color, depth - 1, table)
+                finally:
+                    board.undo_move(start, end, *undo_info)
+
+    if table is not None:
+        table[key] = nodes
+    return nodes
+
+
+def reference_perft(board, color, depth):
+    """
+    perft through the slow path: get_valid_moves filtered by making each
+    move and testing for check. Used to validate the legal move masks.
+    """
+    if depth == 0:
+        return 1
+    opponent_color = 'b' if color == 'w' else 'w'
+    nodes = 0
+    for row in range(board.height):
+        for col in range(board.width):
+            piece = board.get_piece(row, col)
+            if not piece or piece[0] != color:
+                continue
+            for end in board.get_valid_moves(row, col):
+                if would_be_in_check_after_move(board, (row, col), end, color):
+                    continue
+                undo_info = board.make_move((row, col), end)
+                try:
+                    nodes += reference_perft(board, opponent_color, depth - 1)
+                finally:
+                    board.undo_move((row, col), end, *undo_info)
+    return nodes
+
+
+def _divide_worker(data, width, height, packed_move, depth, hashed, reference):
+    """perft below one root move inside a pool process"""
+    position, color = Board.from_bytes(data, width, height)
+    opponent_color = 'b' if color == 'w' else 'w'
+    position.make_move(*decode_move(packed_move, width))
+    if reference:
+        return packed_move, reference_perft(position, opponent_color, depth - 1)
+    return packed_move, perft(position, opponent_color, depth - 1, {} if hashed else None)
+
+
+def divide(board, color, depth, hashed=False, workers=1, reference=False):
+    """
+    perft split by root move: [(move, nodes)]. With workers > 1 the root
+    moves are spread over a process pool.
+    """
+    root_moves = get_all_legal_moves(board, color)
+    if depth < 1 or not root_moves:
+        return []
+    args = (pack_position(board.board, board.width, board.height, color),
+            board.width, board.height)
+    packed_moves = [encode_move(move, board.width) for move in root_moves]
+    if workers == 1:
+        results = [_divide_worker(*args, move, depth, hashed, reference) for move in packed_moves]
+    else:
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            results = list(pool.map(_divide_worker, *zip(*[
+                (*args, move, depth, hashed, reference) for move in packed_moves])))
+    return [(decode_move(move, board.width), nodes) for move, nodes in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count MiniChess move-generation nodes to a fixed depth")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fen", default=START_FEN, help="position to start from")
+    parser.add_argument("--divide", action="store_true", help="print the count below each root move")
+    parser.add_argument("--hash", action="store_true", help="reuse counts of transposed positions")
+    parser.add_argument("--workers", type=int, default=1, help="split the root moves over processes")
+    parser.add_argument("--reference", action="store_true",
+                        help="count with get_valid_moves plus a check test instead of the legal move masks")
+    args = parser.parse_args()
+
+    board, color = Board.from_fen(args.fen)
+    start_time = time.time()
+    if args.divide or args.workers > 1:
+        results = divide(board, color, args.depth, args.hash, args.workers, args.reference)
+        nodes = sum(count for _, count in results)
+    else:
+        results = []
+        if args.reference:
+            nodes = reference_perft(board, color, args.depth)
+        else:
+            nodes = perft(board, color, args.depth, {} if args.hash else None)
+    elapsed = time.time() - start_time
+
+    if args.divide:
+        for (start, end), count in results:
+            print(f"{start} -> {end}: {count}")
+    nps = nodes / elapsed if elapsed > 0 else 0
+    print(f"Depth {args.depth} | Nodes: {nodes} | Time: {elapsed:.2f}s | NPS: {nps:.0f}")
+
+
+if __name__ == "__main__":
+    main()
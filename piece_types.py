@@ -0,0 +1,15 @@
+# Piece names and values shared by the board, hashing, move ordering and
+# evaluation. Retune values here only: every other table derives from it.
+
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+PIECES = [color + typ for color in ('w', 'b') for typ in PIECE_TYPES]
+
+# Material in pawns
+PIECE_VALUES = {
+    'pawn': 1,
+    'knight': 3,
+    'bishop': 3,
+    'rook': 5,
+    'queen': 9,
+    'king': 100
+}
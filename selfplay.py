@@ -0,0 +1,198 @@
+import argparse
+import contextlib
+import json
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import ai
+from app_game_move import expand
+from board import Board
+from encoding import encode_move, decode_move
+from notation import START_FEN
+from transposition import TranspositionTable
+
+# Headless engine-vs-engine games. Each game runs in a pool process and
+# comes back as one JSON record, which the driver appends to the output
+# file as soon as it finishes, so memory use does not grow with the
+# number of games. Moves are stored as packed ints (see encoding.py).
+#
+# An engine is a dict of get_ai_move keyword arguments (difficulty,
+# timeout, max_nodes, use_book) plus optional 'params': values for module-level
+# tuning constants of ai.py, e.g. {'DELTA_MARGIN': 3}, set only while
+# that engine is thinking. Each side keeps its own transposition table.
+
+DEFAULT_OPENING_PLIES = 4  # Random moves played before the engines take over
+DEFAULT_MAX_PLIES = 200  # Games still running after this many plies are drawn
+
+
+def random_opening(seed, plies=DEFAULT_OPENING_PLIES, start_fen=START_FEN):
+    """Up to plies random legal moves from start_fen, as packed ints; stops early if the game ends"""
+    board, color = Board.from_fen(start_fen)
+    rng = random.Random(seed)
+    opening = []
+    for _ in range(plies):
+        legal_moves, _, game_state = expand(board, color)
+        if game_state:
+            break
+        move = rng.choice(legal_moves)
+        opening.append(encode_move(move, board.width))
+        board.make_move(*move)
+        color = 'b' if color == 'w' else 'w'
+    return opening
+
+
+def set_params(params):
+    """Set tuning constants of ai.py by name; returns their previous values"""
+    previous = {}
+    for name, value in params.items():
+        if not hasattr(ai, name):
+            raise ValueError(f"ai.py has no parameter {name!r}")
+        previous[name] = getattr(ai, name)
+        setattr(ai, name, value)
+    return previous
+
+
+def engine_move(board, color, engine, tt):
+    """The engine's move: get_ai_move with the engine's options and parameters"""
+    previous = set_params(engine.get('params', {}))
+    try:
+        return ai.get_ai_move(board, color, engine.get('difficulty', "MEDIUM"),
+                              timeout=engine.get('timeout'),
+                              max_nodes=engine.get('max_nodes'), tt=tt, verbose=False,
+                              use_book=engine.get('use_book', True))
+    finally:
+        set_params(previous)
+
+
+def play_game(white, black, seed=0, opening_plies=DEFAULT_OPENING_PLIES,
+              max_plies=DEFAULT_MAX_PLIES, start_fen=START_FEN, opening=None):
+    """
+    Play one engine-vs-engine game between two engine dicts. The opening
+    is either the given list of packed moves or random_opening(seed,
+    opening_plies). Returns the game record as a dict; its result is
+    "1-0", "0-1" or "1/2-1/2".
+    """
+    board, color = Board.from_fen(start_fen)
+    engines = {'w': white, 'b': black}
+    tables = {'w': TranspositionTable(), 'b': TranspositionTable()}
+    if opening is None:
+        opening = random_opening(seed, opening_plies, start_fen)
+    moves = []
+    result, reason = "1/2-1/2", "max_plies"
+    start_time = time.time()
+
+    while len(moves) < max_plies:
+        legal_moves, _, game_state = expand(board, color)
+        if game_state:
+            reason = game_state
+            if game_state == "checkmate":
+                result = "0-1" if color == 'w' else "1-0"
+            break
+
+        ply = len(moves)
+        if ply < len(opening):
+            move = decode_move(opening[ply], board.width)
+        else:
+            move = engine_move(board, color, engines[color], tables[color])
+        moves.append(encode_move(move, board.width))
+        board.make_move(*move)
+        color = 'b' if color == 'w' else 'w'
+
+    return {
+        'seed': seed,
+        'start_fen': start_fen,
+        'white': white,
+        'black': black,
+        'moves': moves,
+        'result': result,
+        'reason': reason,
+        'plies': len(moves),
+        'seconds': round(time.time() - start_time, 3),
+    }
+
+
+def _play_game_worker(game_id, *args):
+    record = play_game(*args)
+    record['game'] = game_id
+    return record
+
+
+def run_games(jobs, output=None, workers=None, on_game=None):
+    """
+    Play jobs (an iterable of play_game argument tuples) across a process
+    pool, appending each finished game to the output file (if any) as a
+    JSON line. Only a few games per worker are queued at a time.
+    on_game(record) is called for every finished game; when it returns
+    True, the remaining games are cancelled. Returns the number of games
+    played.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    mp_context = multiprocessing.get_context("spawn")
+    jobs = iter(enumerate(jobs))
+    played = 0
+    stop = False
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool, \
+            (open(output, 'a') if output else contextlib.nullcontext()) as file:
+        pending = set()
+        while not stop:
+            while len(pending) < 2 * workers:
+                job = next(jobs, None)
+                if job is None:
+                    break
+                game_id, args = job
+                pending.add(pool.submit(_play_game_worker, game_id, *args))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                if file is not None:
+                    file.write(json.dumps(record) + '\n')
+                    file.flush()
+                played += 1
+                if on_game is not None and on_game(record):
+                    stop = True
+        for future in pending:
+            future.cancel()
+    return played
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play engine-vs-engine MiniChess games without a display")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--white", default="MEDIUM", choices=("EASY", "MEDIUM", "HARD"), help="white's difficulty")
+    parser.add_argument("--black", default="MEDIUM", choices=("EASY", "MEDIUM", "HARD"), help="black's difficulty")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per move (default: the level's, or none with --nodes)")
+    parser.add_argument("--nodes", type=int, default=None, help="node budget per move (default: the level's)")
+    parser.add_argument("--opening-plies", type=int, default=DEFAULT_OPENING_PLIES)
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES)
+    parser.add_argument("--fen", default=START_FEN, help="position every game starts from")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game's opening")
+    parser.add_argument("--output", default="games.jsonl", help="file the games are appended to")
+    args = parser.parse_args()
+
+    timeout = args.timeout
+    if timeout is None and args.nodes is not None:
+        timeout = ai.NO_TIME_LIMIT  # Node-limited games are not also timed
+    white = {'difficulty': args.white, 'timeout': timeout, 'max_nodes': args.nodes}
+    black = {'difficulty': args.black, 'timeout': timeout, 'max_nodes': args.nodes}
+    jobs = ((white, black, args.seed + game, args.opening_plies, args.max_plies, args.fen)
+            for game in range(args.games))
+    scores = {"1-0": 0, "0-1": 0, "1/2-1/2": 0}
+    start_time = time.time()
+
+    def on_game(record):
+        scores[record['result']] += 1
+        played = sum(scores.values())
+        rate = played / (time.time() - start_time) * 60
+        print(f"Game {record['game']}: {record['result']} ({record['reason']}, {record['plies']} plies) | "
+              f"+{scores['1-0']} -{scores['0-1']} ={scores['1/2-1/2']} | {rate:.1f} games/min")
+
+    run_games(jobs, args.output, args.workers, on_game)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import time
+
+# Timed games: a chess clock (base time plus an increment per move) and
+# the engine's allocation of its remaining time to the next move.
+#
+# Each move gets a soft and a hard limit. The hard limit is the search
+# deadline. The soft limit is checked between iterations: once it has
+# passed, no new iteration starts. The soft limit stretches while the
+# best move keeps changing from one iteration to the next, since that
+# is when extra depth is most likely to change the decision.
+
+MIN_MOVES_TO_GO = 10  # Expected moves left in a bare endgame
+MAX_MOVES_TO_GO = 30  # Expected moves left with every piece on the board
+INCREMENT_SHARE = 0.75  # Part of the increment spent on the current move
+HARD_LIMIT_FACTOR = 4  # Hard limit as a multiple of the soft limit
+MAX_TIME_SHARE = 0.3  # Most of the remaining time one move may use
+MOVE_OVERHEAD = 0.1  # Seconds kept back for drawing and moving the piece
+MIN_THINK_TIME = 0.05
+INSTABILITY_DECAY = 0.5
+INSTABILITY_WEIGHT = 1.0  # Soft limit grows by this much per recent best-move change
+
+
+def allocate_time(board, time_left, increment=0.0):
+    """
+    (soft, hard) limits in seconds for the next move, given the side to
+    move's remaining clock time. Fewer pieces means fewer moves are left
+    to play, so each gets a larger share of the clock.
+    """
+    pieces = board.occupied.bit_count()
+    phase = min(1.0, pieces / (4 * board.width))  # 1.0 with the starting material
+    moves_to_go = MIN_MOVES_TO_GO + (MAX_MOVES_TO_GO - MIN_MOVES_TO_GO) * phase
+    usable = max(MIN_THINK_TIME, time_left - MOVE_OVERHEAD)
+    soft = time_left / moves_to_go + increment * INCREMENT_SHARE
+    hard = min(soft * HARD_LIMIT_FACTOR, usable * MAX_TIME_SHARE + increment * INCREMENT_SHARE, usable)
+    hard = max(MIN_THINK_TIME, hard)
+    return min(soft, hard), hard
+
+
+class TimeManager:
+    """Soft-limit check between iterations, stretched by best-move instability"""
+
+    def __init__(self, soft_limit, hard_limit):
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.best_move = None
+        self.instability = 0.0
+
+    def iteration_done(self, best_move, elapsed):
+        """Record an iteration's best move; True when the search should not start another one"""
+        self.instability *= INSTABILITY_DECAY
+        if self.best_move is not None and best_move != self.best_move:
+            self.instability += 1
+        self.best_move = best_move
+        return elapsed >= self.soft_limit * (1 + INSTABILITY_WEIGHT * self.instability)
+
+
+class GameClock:
+    """Chess clock: base seconds per side plus an increment after every move"""
+
+    def __init__(self, base_time, increment=0.0):
+        self.increment = increment
+        self.time_left = {'w': float(base_time), 'b': float(base_time)}
+        self.running = None
+        self._started = None
+
+    def start(self, color):
+        """Start color's clock"""
+        self.running = color
+        self._started = time.time()
+
+    def stop(self):
+        """Stop the running clock, banking the time it used"""
+        if self.running is not None:
+            self.time_left[self.running] = self.remaining(self.running)
+        self.running = None
+
+    def press(self):
+        """The running side has moved: bank its time plus the increment and start the other side"""
+        color = self.running
+        if color is None:
+            return
+        self.stop()
+        self.time_left[color] += self.increment
+        self.start('b' if color == 'w' else 'w')
+
+    def remaining(self, color):
+        left = self.time_left[color]
+        if self.running == color:
+            left -= time.time() - self._started
+        return max(0.0, left)
+
+    def flagged(self, color):
+        """True once color has run out of time"""
+        return self.remaining(color) <= 0
@@ -0,0 +1,175 @@
+import argparse
+import ast
+import math
+import time
+
+import ai
+from notation import START_FEN
+from selfplay import random_opening, run_games, DEFAULT_OPENING_PLIES, DEFAULT_MAX_PLIES
+
+# Match two engine configurations (see selfplay.py for the engine dict)
+# to decide whether a change is an improvement. Games come in pairs that
+# share a random opening, with each engine playing white once, so that
+# lopsided openings cancel out. After every game a sequential
+# probability ratio test weighs "A is elo0 stronger than B" (H0) against
+# "A is elo1 stronger" (H1), and the match stops as soon as either is
+# accepted, which usually takes far fewer games than a fixed-size match.
+
+DEFAULT_ELO0 = 0
+DEFAULT_ELO1 = 10
+DEFAULT_ALPHA = 0.05  # Chance of accepting H1 when H0 is true
+DEFAULT_BETA = 0.05  # Chance of accepting H0 when H1 is true
+PSEUDO_COUNT = 0.5  # Games of each outcome added when estimating the score variance
+
+
+def elo_to_score(elo):
+    """Expected score of the stronger side for an Elo difference"""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score):
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+
+def sprt_bounds(alpha=DEFAULT_ALPHA, beta=DEFAULT_BETA):
+    """(lower, upper) log-likelihood-ratio bounds: accept H0 below lower, H1 above upper"""
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def sprt_llr(wins, draws, losses, elo0=DEFAULT_ELO0, elo1=DEFAULT_ELO1):
+    """
+    Log-likelihood ratio of H1 against H0 for a win/draw/loss record,
+    using the normal approximation of the per-game score. The variance
+    is estimated with PSEUDO_COUNT extra games of each outcome, so
+    one-sided records (no wins or no losses yet) can still stop a match.
+
+    >>> sprt_llr(40, 10, 0) > sprt_bounds()[1]
+    True
+    >>> sprt_llr(0, 10, 40) < sprt_bounds()[0]
+    True
+    """
+    games = wins + draws + losses
+    if not games:
+        return 0.0
+    score = (wins + draws / 2) / games
+    smoothed = games + 3 * PSEUDO_COUNT
+    smoothed_score = (wins + draws / 2 + 1.5 * PSEUDO_COUNT) / smoothed
+    variance = (wins + draws / 4 + 1.25 * PSEUDO_COUNT) / smoothed - smoothed_score ** 2
+    if variance <= 0:
+        return 0.0
+    s0 = elo_to_score(elo0)
+    s1 = elo_to_score(elo1)
+    return games * (s1 - s0) * (2 * score - s0 - s1) / (2 * variance)
+
+
+def tournament_jobs(engine_a, engine_b, pairs, seed, opening_plies, max_plies, start_fen):
+    """play_game argument tuples: each opening played twice, colors swapped"""
+    for pair in range(pairs):
+        opening = random_opening(seed + pair, opening_plies, start_fen)
+        yield engine_a, engine_b, seed + pair, opening_plies, max_plies, start_fen, opening
+        yield engine_b, engine_a, seed + pair, opening_plies, max_plies, start_fen, opening
+
+
+def run_tournament(engine_a, engine_b, pairs=500, workers=None, elo0=DEFAULT_ELO0, elo1=DEFAULT_ELO1,
+                   alpha=DEFAULT_ALPHA, beta=DEFAULT_BETA, seed=0, opening_plies=DEFAULT_OPENING_PLIES,
+                   max_plies=DEFAULT_MAX_PLIES, start_fen=START_FEN, output=None):
+    """
+    Play up to pairs game pairs of engine A against engine B, stopping
+    early once the SPRT decides. engine_a and engine_b must differ (e.g.
+    by a 'name' key) so results can be told apart. Returns (wins, draws,
+    losses) from A's point of view and the verdict: "H1" (A is better),
+    "H0" or None if the games ran out first.
+    """
+    lower, upper = sprt_bounds(alpha, beta)
+    record = {'wins': 0, 'draws': 0, 'losses': 0}
+    verdict = [None]
+    start_time = time.time()
+
+    def on_game(game):
+        a_is_white = game['white'] == engine_a
+        if game['result'] == "1/2-1/2":
+            record['draws'] += 1
+        elif (game['result'] == "1-0") == a_is_white:
+            record['wins'] += 1
+        else:
+            record['losses'] += 1
+        wins, draws, losses = record['wins'], record['draws'], record['losses']
+        games = wins + draws + losses
+        llr = sprt_llr(wins, draws, losses, elo0, elo1)
+        elo = score_to_elo((wins + draws / 2) / games)
+        rate = games / (time.time() - start_time) * 60
+        print(f"Games {games}: +{wins} -{losses} ={draws} | Elo {elo:+.1f} | "
+              f"LLR {llr:.2f} ({lower:.2f}, {upper:.2f}) | {rate:.1f} games/min")
+        if llr >= upper:
+            verdict[0] = "H1"
+        elif llr <= lower:
+            verdict[0] = "H0"
+        return verdict[0] is not None
+
+    jobs = tournament_jobs(engine_a, engine_b, pairs, seed, opening_plies, max_plies, start_fen)
+    run_games(jobs, output, workers, on_game)
+    return (record['wins'], record['draws'], record['losses']), verdict[0]
+
+
+def parse_params(items):
+    """NAME=VALUE strings into a parameter dict; values are Python literals"""
+    params = {}
+    for item in items or []:
+        name, _, value = item.partition('=')
+        params[name] = ast.literal_eval(value)
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match two engine configurations with an SPRT stopping rule")
+    for side in ("a", "b"):
+        parser.add_argument(f"--{side}-difficulty", default="HARD", choices=("EASY", "MEDIUM", "HARD"))
+        parser.add_argument(f"--{side}-param", action="append", metavar="NAME=VALUE",
+                            help="override an ai.py constant for this engine (repeatable)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per move")
+    parser.add_argument("--nodes", type=int, default=None, help="node budget per move")
+    parser.add_argument("--pairs", type=int, default=500, help="most game pairs to play")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--elo0", type=float, default=DEFAULT_ELO0)
+    parser.add_argument("--elo1", type=float, default=DEFAULT_ELO1)
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    parser.add_argument("--beta", type=float, default=DEFAULT_BETA)
+    parser.add_argument("--opening-plies", type=int, default=DEFAULT_OPENING_PLIES)
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES)
+    parser.add_argument("--fen", default=START_FEN, help="position every opening starts from")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="also append the games to this file")
+    args = parser.parse_args()
+
+    if args.timeout is None and args.nodes is None:
+        parser.error("give a fixed --timeout or --nodes limit")
+    # A node-limited match must not also stop on the clock, or results
+    # would depend on how loaded the host is
+    timeout = args.timeout if args.timeout is not None else ai.NO_TIME_LIMIT
+    engines = {}
+    for side in ("a", "b"):
+        engines[side] = {
+            'name': side.upper(),
+            'difficulty': getattr(args, f"{side}_difficulty"),
+            'timeout': timeout,
+            'max_nodes': args.nodes,
+            'params': parse_params(getattr(args, f"{side}_param")),
+        }
+
+    (wins, draws, losses), verdict = run_tournament(
+        engines['a'], engines['b'], args.pairs, args.workers, args.elo0, args.elo1,
+        args.alpha, args.beta, args.seed, args.opening_plies, args.max_plies, args.fen, args.output)
+    if verdict == "H1":
+        print(f"H1 accepted: A is stronger than B (elo0 {args.elo0}, elo1 {args.elo1})")
+    elif verdict == "H0":
+        print(f"H0 accepted: A is not stronger than B (elo0 {args.elo0}, elo1 {args.elo1})")
+    else:
+        print("No decision: the game limit was reached first")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import struct
+
+# Bound types stored with each entry
+EXACT = 0
+LOWER = 1  # Score is at least this value (search failed high)
+UPPER = 2  # Score is at most this value (search failed low)
+
+DEFAULT_SIZE = 1 << 16
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by Zobrist hash.
+    Scores are stored from the point of view of the side to move.
+    Each slot holds one entry: deeper results are kept over shallower
+    ones, except that entries left over from older searches are always
+    replaced.
+    """
+
+    def __init__(self, size=DEFAULT_SIZE):
+        self.size = max(1, int(size))
+        self.table = [None] * self.size
+        self.generation = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """Age existing entries so a new search can overwrite them"""
+        self.generation += 1
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self):
+        self.table = [None] * self.size
+        self.generation = 0
+
+    def resize(self, size):
+        """Change the number of slots, dropping all stored entries"""
+        self.size = max(1, int(size))
+        self.clear()
+
+    def probe(self, key):
+        """Return (depth, bound, score, move) for key, or None"""
+        entry = self.table[key % self.size]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1], entry[2], entry[3], entry[4]
+        return None
+
+    def store(self, key, depth, bound, score, move):
+        index = key % self.size
+        old = self.table[index]
+        if (old is None or old[0] == key or old[5] != self.generation
+                or depth >= old[1]):
+            # Keep the previous best move if this search did not produce one
+            if move is None and old is not None and old[0] == key:
+                move = old[4]
+            self.table[index] = (key, depth, bound, score, move, self.generation)
+            self.stores += 1
+
+    def usage(self):
+        """Fraction of slots written during the current search"""
+        used = sum(1 for entry in self.table if entry is not None and entry[5] == self.generation)
+        return used / self.size
+
+
+# Shared-memory table layout: a 16-byte header (slot count, generation)
+# followed by 16-byte slots of two little-endian 64-bit words,
+# (key ^ data, data). data packs, from the low bits up:
+#   score      32 bits  signed, in units of SCORE_SCALE
+#   depth       8 bits
+#   bound       2 bits
+#   move       13 bits  valid flag + start row/col + end row/col (3 bits each)
+#   generation  8 bits
+# Writers never lock: a slot torn by two concurrent writes fails the
+# key ^ data check on probe and simply reads as a miss.
+HEADER = struct.Struct('<QQ')
+SLOT = struct.Struct('<QQ')
+SCORE_SCALE = 10000
+SCORE_LIMIT = (1 << 31) - 1
+DEFAULT_SHARED_SIZE = 1 << 18
+KEY_MASK = (1 << 64) - 1
+
+
+def pack_entry(depth, bound, score, move, generation):
+    """Pack one entry's fields into a 64-bit word"""
+    score = max(-SCORE_LIMIT, min(SCORE_LIMIT, round(score * SCORE_SCALE)))
+    packed_move = 0
+    if move is not None:
+        (sr, sc), (er, ec) = move
+        packed_move = 1 | sr << 1 | sc << 4 | er << 7 | ec << 10
+    return ((score & 0xFFFFFFFF)
+            | min(depth, 255) << 32
+            | bound << 40
+            | packed_move << 42
+            | (generation & 0xFF) << 55)
+
+
+def unpack_entry(data):
+    """Inverse of pack_entry: (depth, bound, score, move, generation)"""
+    score = data & 0xFFFFFFFF
+    if score >= 1 << 31:
+        score -= 1 << 32
+    packed_move = (data >> 42) & 0x1FFF
+    move = None
+    if packed_move & 1:
+        move = (((packed_move >> 1) & 7, (packed_move >> 4) & 7),
+                ((packed_move >> 7) & 7, (packed_move >> 10) & 7))
+    return (data >> 32) & 0xFF, (data >> 40) & 3, score / SCORE_SCALE, move, (data >> 55) & 0xFF
+
+
+class SharedTranspositionTable:
+    """
+    TranspositionTable backed by multiprocessing.shared_memory, so every
+    process attached to it reads and writes the same entries. Create it
+    once, pass `name` to the workers and have them call attach(name).
+    Memory use is fixed by the slot count, however many workers attach.
+    """
+
+    def __init__(self, size=DEFAULT_SHARED_SIZE, name=None):
+        from multiprocessing import shared_memory
+        self.owner = name is None
+        if self.owner:
+            size = max(1, int(size))
+            self.shm = shared_memory.SharedMemory(create=True, size=HEADER.size + size * SLOT.size)
+            self.shm.buf[:HEADER.size + size * SLOT.size] = bytes(HEADER.size + size * SLOT.size)
+            HEADER.pack_into(self.shm.buf, 0, size, 1)
+        else:
+            self.shm = _attach_shared_memory(name)
+        self.name = self.shm.name
+        self.size, self.generation = HEADER.unpack_from(self.shm.buf, 0)
+        self.hits = 0
+        self.stores = 0
+
+    @classmethod
+    def attach(cls, name):
+        """Open a table created by another process"""
+        return cls(name=name)
+
+    def new_search(self):
+        """The creating process ages entries; attached processes pick up its generation"""
+        if self.owner:
+            # Generations run 1..255 so a used slot never packs to zero
+            self.generation = HEADER.unpack_from(self.shm.buf, 0)[1] % 255 + 1
+            HEADER.pack_into(self.shm.buf, 0, self.size, self.generation)
+        else:
+            self.generation = HEADER.unpack_from(self.shm.buf, 0)[1]
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self):
+        self.shm.buf[HEADER.size:HEADER.size + self.size * SLOT.size] = bytes(self.size * SLOT.size)
+
+    def _read(self, index):
+        checked_key, data = SLOT.unpack_from(self.shm.buf, HEADER.size + index * SLOT.size)
+        return checked_key ^ data, data
+
+    def probe(self, key):
+        """Return (depth, bound, score, move) for key, or None"""
+        stored_key, data = self._read(key % self.size)
+        if data and stored_key == key:
+            self.hits += 1
+            return unpack_entry(data)[:4]
+        return None
+
+    def store(self, key, depth, bound, score, move):
+        index = key % self.size
+        old_key, old_data = self._read(index)
+        if old_data and old_key != key:
+            old_depth, _, _, _, old_generation = unpack_entry(old_data)
+            if old_generation == self.generation and depth < old_depth:
+                return
+        if move is None and old_data and old_key == key:
+            move = unpack_entry(old_data)[3]
+        data = pack_entry(depth, bound, score, move, self.generation)
+        SLOT.pack_into(self.shm.buf, HEADER.size + index * SLOT.size, (key ^ data) & KEY_MASK, data)
+        self.stores += 1
+
+    def usage(self):
+        """Fraction of slots written during the current search"""
+        used = 0
+        for index in range(self.size):
+            _, data = self._read(index)
+            if data and unpack_entry(data)[4] == self.generation:
+                used += 1
+        return used / self.size
+
+    def close(self):
+        """Detach from the table; the creating process also frees it"""
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _attach_shared_memory(name):
+    """
+    Attach to an existing block without letting this process's exit free it.
+    Before Python 3.13 this relies on the attaching process sharing the
+    creator's resource tracker, as multiprocessing children do.
+    """
+    from multiprocessing import shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        return shared_memory.SharedMemory(name=name)
@@ -0,0 +1,39 @@
+import random
+
+from piece_types import PIECES
+
+# Zobrist keys for incremental position hashing.
+# A fixed seed keeps keys identical across runs and processes, so hashes
+# can be shared between workers or stored on disk.
+ZOBRIST_SEED = 0x5EED
+MAX_ROWS = 8
+MAX_COLS = 8
+
+def _generate_keys():
+    """Build the random 64-bit key tables"""
+    rng = random.Random(ZOBRIST_SEED)
+    piece_keys = {
+        piece: [[rng.getrandbits(64) for _ in range(MAX_COLS)] for _ in range(MAX_ROWS)]
+        for piece in PIECES
+    }
+    side_key = rng.getrandbits(64)
+    return piece_keys, side_key
+
+
+PIECE_KEYS, SIDE_KEY = _generate_keys()
+
+
+def compute_hash(board):
+    """Compute the piece-placement hash of a board from scratch"""
+    h = 0
+    for r in range(board.height):
+        for c in range(board.width):
+            piece = board.board[r][c]
+            if piece:
+                h ^= PIECE_KEYS[piece][r][c]
+    return h
+
+
+def position_key(board, color):
+    """Hash of the board with the side to move folded in"""
+    return board.hash ^ SIDE_KEY if color == 'b' else board.hash